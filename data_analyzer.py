@@ -7,48 +7,220 @@ Utility script to analyze and export scraped Reddit data.
 Provides insights into the scraped dataset and export capabilities.
 """
 
+import os
 import sqlite3
-import json
+import orjson
 import csv
-import pandas as pd
 from datetime import datetime
-from typing import Dict, List, Optional
-import matplotlib.pyplot as plt
-import seaborn as sns
-from collections import Counter
+from heapq import nlargest
+from itertools import groupby
+from operator import itemgetter
+from typing import Callable, Dict, Iterator, List, Optional
 import re
 
+# Words of three or more letters, matched against lowercased titles
+TITLE_WORD_RE = re.compile(r'\b[a-z]{3,}\b')
+
+# Compact column dtypes for DataFrame exports. Nullable types keep NULLs
+# intact, and flags stay 0/1 integers so CSV output is unchanged.
+POST_DTYPES = {
+    'score': 'Int32',
+    'num_comments': 'Int32',
+    'upvote_ratio': 'Float32',
+    'is_self': 'Int8',
+}
+COMMENT_DTYPES = {
+    'score': 'Int32',
+    'depth': 'Int16',
+    'is_submitter': 'Int8',
+}
+
+def iter_rows(cursor: sqlite3.Cursor, chunk_size: int = 10000) -> Iterator[sqlite3.Row]:
+    """Yield rows from an executed cursor, fetching them in chunks"""
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            return
+        yield from rows
+
 class RedditDataAnalyzer:
     """Analyze and export scraped Reddit data"""
     
-    def __init__(self, db_path: str = "reddit_data.db"):
+    def __init__(self, db_path: str = "reddit_data.db", cache_path: str = "analysis_cache.db"):
         self.db_path = db_path
         self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        
+        # Tune the connection for read-heavy analytics
+        self.conn.executescript('''
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA cache_size=-262144;
+            PRAGMA mmap_size=1073741824;
+        ''')
         
-    def get_overview_stats(self) -> Dict:
-        """Get overview statistics of the dataset"""
-        cursor = self.conn.cursor()
-        
-        # Basic counts
-        cursor.execute('SELECT COUNT(*) FROM posts')
-        total_posts = cursor.fetchone()[0]
+        # Indexes backing the author and temporal GROUP BY queries and the JSON export
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_posts_author ON posts(author)')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_posts_created_utc ON posts(created_utc)')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_comments_post_created ON comments(post_id, created_utc)')
+        self.conn.commit()
+        self._refresh_title_tokens()
+        
+        # All writes happen above; everything after this point only reads
+        self.conn.execute('PRAGMA query_only=1')
+        
+        # Persistent cache of analysis results as JSON, invalidated when the database changes
+        self.cache_conn = sqlite3.connect(cache_path)
+        self.cache_conn.execute('''
+            CREATE TABLE IF NOT EXISTS analysis_cache (
+                name TEXT,
+                db_path TEXT,
+                version TEXT,
+                payload BLOB,
+                PRIMARY KEY (name, db_path)
+            )
+        ''')
+        self.cache_conn.commit()
         
-        cursor.execute('SELECT COUNT(*) FROM comments')
-        total_comments = cursor.fetchone()[0]
+        self._seen_data_version = None
+        self._fingerprint = None
+    
+    def _data_version(self) -> str:
+        """Fingerprint of the database contents, from the highest rowids and the database files"""
+        cursor = self.conn.cursor()
         
-        cursor.execute('SELECT COUNT(DISTINCT author) FROM posts WHERE author != "[deleted]"')
-        unique_authors = cursor.fetchone()[0]
+        # data_version only changes when another connection commits, so the
+        # fingerprint is re-read only after the database was written to
+        cursor.execute('PRAGMA data_version')
+        data_version = cursor.fetchone()[0]
+        if data_version != self._seen_data_version:
+            # The highest rowids change on every insert. Upserts (quick_start)
+            # rewrite rows in place, which only shows in the files: any commit
+            # changes the mtime or size of the database or its write-ahead log.
+            cursor.execute('SELECT (SELECT MAX(rowid) FROM posts), (SELECT MAX(rowid) FROM comments)')
+            parts = [str(value) for value in cursor.fetchone()]
+            for path in (self.db_path, self.db_path + '-wal'):
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    parts.append('-')
+                else:
+                    parts.append(f'{stat.st_mtime_ns}-{stat.st_size}')
+            self._fingerprint = ':'.join(parts)
+            self._seen_data_version = data_version
+        
+        return self._fingerprint
+    
+    def _cached(self, name: str, compute: Callable[[], Dict],
+                decode: Optional[Callable[[Dict], Dict]] = None) -> Dict:
+        """
+        Return a cached analysis result, recomputing it if the database changed
+        
+        Results are stored as JSON; decode restores the types JSON can't hold
+        (datetimes, non-string keys) when a result is read back from the cache.
+        """
+        db_path = os.path.abspath(self.db_path)
+        version = self._data_version()
+        
+        cursor = self.cache_conn.cursor()
+        cursor.execute(
+            'SELECT version, payload FROM analysis_cache WHERE name = ? AND db_path = ?',
+            (name, db_path)
+        )
+        row = cursor.fetchone()
+        if row and row[0] == version:
+            try:
+                result = orjson.loads(row[1])
+            except orjson.JSONDecodeError:
+                pass  # Left by an older cache format; recompute and overwrite it
+            else:
+                return decode(result) if decode else result
+        
+        result = compute()
+        cursor.execute(
+            'INSERT OR REPLACE INTO analysis_cache (name, db_path, version, payload) VALUES (?, ?, ?, ?)',
+            (name, db_path, version, orjson.dumps(result, option=orjson.OPT_NON_STR_KEYS))
+        )
+        self.cache_conn.commit()
+        return result
+    
+    def _refresh_title_tokens(self):
+        """Tokenize titles of posts scraped since the last refresh"""
+        cursor = self.conn.cursor()
         
-        cursor.execute('SELECT COUNT(DISTINCT post_id) FROM comments')
-        posts_with_comments = cursor.fetchone()[0]
+        cursor.execute('CREATE TABLE IF NOT EXISTS title_tokens (post_id TEXT, token TEXT)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_title_tokens_token ON title_tokens(token)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_title_tokens_post_id ON title_tokens(post_id)')
+        # Highest posts rowid already tokenized, so titles without any tokens
+        # aren't picked up again (posts are insert-only, rowids only grow)
+        cursor.execute('CREATE TABLE IF NOT EXISTS title_tokens_progress (last_rowid INTEGER NOT NULL)')
+        self.conn.commit()
+        
+        cursor.execute('SELECT last_rowid FROM title_tokens_progress')
+        progress = cursor.fetchone()
+        cursor.execute('SELECT MAX(rowid) FROM posts')
+        max_rowid = cursor.fetchone()[0] or 0
+        if progress is not None and progress[0] >= max_rowid:
+            return
+        
+        # Deferred so that runs without new posts never pay for the pandas import
+        import pandas as pd
+        
+        if progress is None:
+            # Tokens written before the progress table existed: fill in what's missing once
+            untokenized_posts = '''
+                SELECT id AS post_id, title FROM posts p
+                WHERE rowid <= ?
+                AND NOT EXISTS (SELECT 1 FROM title_tokens t WHERE t.post_id = p.id)
+            '''
+            params = (max_rowid,)
+        else:
+            untokenized_posts = 'SELECT id AS post_id, title FROM posts WHERE rowid > ? AND rowid <= ?'
+            params = (progress[0], max_rowid)
+        
+        titles = pd.read_sql_query(untokenized_posts, self.conn, params=params, index_col='post_id')['title']
+        
+        # Simple word extraction (can be enhanced with NLP)
+        tokens = titles.fillna('').str.lower().str.findall(TITLE_WORD_RE).explode().dropna()
+        
+        cursor.executemany(
+            'INSERT INTO title_tokens (post_id, token) VALUES (?, ?)',
+            zip(tokens.index, tokens)
+        )
+        cursor.execute('DELETE FROM title_tokens_progress')
+        cursor.execute('INSERT INTO title_tokens_progress (last_rowid) VALUES (?)', (max_rowid,))
+        self.conn.commit()
         
-        # Time range
-        cursor.execute('SELECT MIN(created_utc), MAX(created_utc) FROM posts')
-        time_range = cursor.fetchone()
+    def get_overview_stats(self) -> Dict:
+        """Get overview statistics of the dataset"""
+        return self._cached('overview', self._compute_overview_stats, self._decode_overview_stats)
+    
+    @staticmethod
+    def _decode_overview_stats(stats: Dict) -> Dict:
+        """Restore the post dates of cached overview statistics"""
+        for key in ('earliest_post', 'latest_post'):
+            if stats[key] is not None:
+                stats[key] = datetime.fromisoformat(stats[key])
+        return stats
+    
+    def _compute_overview_stats(self) -> Dict:
+        """Query overview statistics (uncached)"""
+        cursor = self.conn.cursor()
         
-        # Average stats
-        cursor.execute('SELECT AVG(score), AVG(num_comments) FROM posts')
-        avg_stats = cursor.fetchone()
+        # Counts, time range and averages in a single round-trip
+        cursor.execute('''
+            SELECT
+                (SELECT COUNT(*) FROM posts),
+                (SELECT COUNT(*) FROM comments),
+                (SELECT COUNT(DISTINCT author) FROM posts WHERE author != '[deleted]'),
+                (SELECT COUNT(DISTINCT post_id) FROM comments),
+                MIN(created_utc), MAX(created_utc),
+                AVG(score), AVG(num_comments)
+            FROM posts
+        ''')
+        (total_posts, total_comments, unique_authors, posts_with_comments,
+         earliest_utc, latest_utc, avg_score, avg_comments) = cursor.fetchone()
         
         # Top scoring post
         cursor.execute('SELECT title, score FROM posts ORDER BY score DESC LIMIT 1')
@@ -60,16 +232,20 @@ class RedditDataAnalyzer:
             'unique_authors': unique_authors,
             'posts_with_comments': posts_with_comments,
             'coverage_percentage': (posts_with_comments / total_posts * 100) if total_posts > 0 else 0,
-            'earliest_post': datetime.fromtimestamp(time_range[0]) if time_range[0] else None,
-            'latest_post': datetime.fromtimestamp(time_range[1]) if time_range[1] else None,
-            'avg_score': round(avg_stats[0], 2) if avg_stats[0] else 0,
-            'avg_comments': round(avg_stats[1], 2) if avg_stats[1] else 0,
+            'earliest_post': datetime.fromtimestamp(earliest_utc) if earliest_utc else None,
+            'latest_post': datetime.fromtimestamp(latest_utc) if latest_utc else None,
+            'avg_score': round(avg_score, 2) if avg_score else 0,
+            'avg_comments': round(avg_comments, 2) if avg_comments else 0,
             'top_post_title': top_post[0] if top_post else None,
             'top_post_score': top_post[1] if top_post else 0
         }
     
     def get_temporal_analysis(self) -> Dict:
         """Analyze posting patterns over time"""
+        return self._cached('temporal', self._compute_temporal_analysis)
+    
+    def _compute_temporal_analysis(self) -> Dict:
+        """Query posting patterns over time (uncached)"""
         cursor = self.conn.cursor()
         
         # Posts per month
@@ -114,6 +290,19 @@ class RedditDataAnalyzer:
     
     def get_author_analysis(self) -> Dict:
         """Analyze author activity"""
+        return self._cached('authors', self._compute_author_analysis, self._decode_author_analysis)
+    
+    @staticmethod
+    def _decode_author_analysis(analysis: Dict) -> Dict:
+        """Restore the integer post counts keying a cached activity distribution"""
+        analysis['activity_distribution'] = {
+            int(post_count): author_count
+            for post_count, author_count in analysis['activity_distribution'].items()
+        }
+        return analysis
+    
+    def _compute_author_analysis(self) -> Dict:
+        """Query author activity (uncached)"""
         cursor = self.conn.cursor()
         
         # Top authors by post count
@@ -176,15 +365,14 @@ class RedditDataAnalyzer:
         post_types = dict(cursor.fetchall())
         
         # Most common words in titles
-        cursor.execute('SELECT title FROM posts')
-        titles = [row[0] for row in cursor.fetchall()]
-        title_words = []
-        for title in titles:
-            # Simple word extraction (can be enhanced with NLP)
-            words = re.findall(r'\b[a-zA-Z]{3,}\b', title.lower())
-            title_words.extend(words)
-        
-        common_words = dict(Counter(title_words).most_common(30))
+        cursor.execute('''
+            SELECT token, COUNT(*) as count
+            FROM title_tokens
+            GROUP BY token
+            ORDER BY count DESC, token
+            LIMIT 30
+        ''')
+        common_words = dict(cursor.fetchall())
         
         # Score distribution
         cursor.execute('''
@@ -210,142 +398,117 @@ class RedditDataAnalyzer:
         }
     
     def export_to_json(self, filename: str = "reddit_data_export.json"):
-        """Export all data to JSON format"""
+        """Export all data to JSON format, streaming one post at a time"""
         cursor = self.conn.cursor()
+        comment_cursor = self.conn.cursor()
+        
+        cursor.execute('SELECT COUNT(*) FROM posts')
+        total_posts = cursor.fetchone()[0]
+        cursor.execute('SELECT COUNT(*) FROM comments WHERE post_id IN (SELECT id FROM posts)')
+        total_comments = cursor.fetchone()[0]
         
-        # Get all posts
+        metadata = {
+            'export_date': datetime.now().isoformat(),
+            'total_posts': total_posts,
+            'total_comments': total_comments
+        }
+        
+        # Stream comments in the same order as posts, grouped per post
+        comment_cursor.execute('''
+            SELECT c.id, c.parent_id, c.body, c.author, c.created_utc,
+                   strftime('%Y-%m-%dT%H:%M:%S', c.created_utc, 'unixepoch', 'localtime') as created_datetime,
+                   c.score, c.permalink, c.depth, c.is_submitter, c.post_id
+            FROM comments c
+            JOIN posts p ON p.id = c.post_id
+            ORDER BY p.created_utc, p.id, c.created_utc
+        ''')
+        comment_groups = groupby(iter_rows(comment_cursor), key=itemgetter('post_id'))
+        next_group = next(comment_groups, None)
+        
+        # Get all posts (created_datetime is derived in SQLite, in local time)
         cursor.execute('''
-            SELECT id, title, selftext, author, created_utc, score, num_comments,
-                   url, permalink, subreddit, upvote_ratio, is_self, 
+            SELECT id, title, selftext, author, created_utc,
+                   strftime('%Y-%m-%dT%H:%M:%S', created_utc, 'unixepoch', 'localtime') as created_datetime,
+                   score, num_comments, url, permalink, subreddit, upvote_ratio, is_self, 
                    link_flair_text, post_hint
             FROM posts
-            ORDER BY created_utc
+            ORDER BY created_utc, id
         ''')
         
-        posts = []
-        for row in cursor.fetchall():
-            post = {
-                'id': row[0],
-                'title': row[1],
-                'selftext': row[2],
-                'author': row[3],
-                'created_utc': row[4],
-                'created_datetime': datetime.fromtimestamp(row[4]).isoformat(),
-                'score': row[5],
-                'num_comments': row[6],
-                'url': row[7],
-                'permalink': row[8],
-                'subreddit': row[9],
-                'upvote_ratio': row[10],
-                'is_self': bool(row[11]),
-                'link_flair_text': row[12],
-                'post_hint': row[13],
-                'comments': []
-            }
-            
-            # Get comments for this post
-            cursor.execute('''
-                SELECT id, parent_id, body, author, created_utc, score,
-                       permalink, depth, is_submitter
-                FROM comments
-                WHERE post_id = ?
-                ORDER BY created_utc
-            ''', (row[0],))
+        with open(filename, 'wb') as f:
+            f.write(b'{"metadata":' + orjson.dumps(metadata) + b',"posts":[')
             
-            for comment_row in cursor.fetchall():
-                comment = {
-                    'id': comment_row[0],
-                    'parent_id': comment_row[1],
-                    'body': comment_row[2],
-                    'author': comment_row[3],
-                    'created_utc': comment_row[4],
-                    'created_datetime': datetime.fromtimestamp(comment_row[4]).isoformat(),
-                    'score': comment_row[5],
-                    'permalink': comment_row[6],
-                    'depth': comment_row[7],
-                    'is_submitter': bool(comment_row[8])
-                }
-                post['comments'].append(comment)
+            for i, row in enumerate(iter_rows(cursor)):
+                post = dict(row)
+                post['is_self'] = bool(post['is_self'])
+                post['comments'] = []
+                
+                # Take this post's comments if the comment stream is on it
+                if next_group is not None and next_group[0] == row['id']:
+                    for comment_row in next_group[1]:
+                        comment = dict(comment_row)
+                        del comment['post_id']
+                        comment['is_submitter'] = bool(comment['is_submitter'])
+                        post['comments'].append(comment)
+                    next_group = next(comment_groups, None)
+                
+                f.write(b',\n' if i else b'\n')
+                f.write(orjson.dumps(post))
             
-            posts.append(post)
+            f.write(b'\n]}\n')
         
-        # Export to JSON
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump({
-                'metadata': {
-                    'export_date': datetime.now().isoformat(),
-                    'total_posts': len(posts),
-                    'total_comments': sum(len(post['comments']) for post in posts)
-                },
-                'posts': posts
-            }, f, indent=2, ensure_ascii=False)
-        
-        print(f"Exported {len(posts)} posts to {filename}")
+        print(f"Exported {total_posts} posts to {filename}")
     
-    def export_to_csv(self, posts_filename: str = "posts.csv", comments_filename: str = "comments.csv"):
-        """Export data to CSV format"""
-        cursor = self.conn.cursor()
-        
-        # Export posts
-        cursor.execute('''
-            SELECT id, title, selftext, author, created_utc, score, num_comments,
-                   url, permalink, subreddit, upvote_ratio, is_self, 
+    def _load_posts_frame(self):
+        """Load all posts into a DataFrame (created_datetime is derived in SQLite, in local time)"""
+        import pandas as pd
+        
+        return pd.read_sql_query('''
+            SELECT id, title, selftext, author, created_utc,
+                   strftime('%Y-%m-%dT%H:%M:%S', created_utc, 'unixepoch', 'localtime') as created_datetime,
+                   score, num_comments, url, permalink, subreddit, upvote_ratio, is_self, 
                    link_flair_text, post_hint
             FROM posts
             ORDER BY created_utc
-        ''')
-        
-        posts_data = []
-        for row in cursor.fetchall():
-            posts_data.append({
-                'id': row[0],
-                'title': row[1],
-                'selftext': row[2],
-                'author': row[3],
-                'created_utc': row[4],
-                'created_datetime': datetime.fromtimestamp(row[4]).isoformat(),
-                'score': row[5],
-                'num_comments': row[6],
-                'url': row[7],
-                'permalink': row[8],
-                'subreddit': row[9],
-                'upvote_ratio': row[10],
-                'is_self': row[11],
-                'link_flair_text': row[12],
-                'post_hint': row[13]
-            })
-        
-        df_posts = pd.DataFrame(posts_data)
-        df_posts.to_csv(posts_filename, index=False)
-        print(f"Exported {len(posts_data)} posts to {posts_filename}")
-        
-        # Export comments
-        cursor.execute('''
-            SELECT id, post_id, parent_id, body, author, created_utc, score,
-                   permalink, depth, is_submitter
+        ''', self.conn, dtype=POST_DTYPES)
+    
+    def _load_comments_frame(self):
+        """Load all comments into a DataFrame (created_datetime is derived in SQLite, in local time)"""
+        import pandas as pd
+        
+        return pd.read_sql_query('''
+            SELECT id, post_id, parent_id, body, author, created_utc,
+                   strftime('%Y-%m-%dT%H:%M:%S', created_utc, 'unixepoch', 'localtime') as created_datetime,
+                   score, permalink, depth, is_submitter
             FROM comments
             ORDER BY created_utc
-        ''')
-        
-        comments_data = []
-        for row in cursor.fetchall():
-            comments_data.append({
-                'id': row[0],
-                'post_id': row[1],
-                'parent_id': row[2],
-                'body': row[3],
-                'author': row[4],
-                'created_utc': row[5],
-                'created_datetime': datetime.fromtimestamp(row[5]).isoformat(),
-                'score': row[6],
-                'permalink': row[7],
-                'depth': row[8],
-                'is_submitter': row[9]
-            })
-        
-        df_comments = pd.DataFrame(comments_data)
-        df_comments.to_csv(comments_filename, index=False)
-        print(f"Exported {len(comments_data)} comments to {comments_filename}")
+        ''', self.conn, dtype=COMMENT_DTYPES)
+    
+    def export_to_csv(self, posts_filename: str = "posts.csv", comments_filename: str = "comments.csv"):
+        """
+        Export data to CSV format
+        
+        Post and comment bodies are full of quotes, commas and newlines, which makes
+        CSV slow to write and large on disk. Prefer export_to_parquet for big datasets.
+        """
+        df_posts = self._load_posts_frame()
+        df_posts.to_csv(posts_filename, index=False, chunksize=50_000)
+        print(f"Exported {len(df_posts)} posts to {posts_filename}")
+        
+        df_comments = self._load_comments_frame()
+        df_comments.to_csv(comments_filename, index=False, chunksize=50_000)
+        print(f"Exported {len(df_comments)} comments to {comments_filename}")
+    
+    def export_to_parquet(self, posts_filename: str = "posts.parquet",
+                          comments_filename: str = "comments.parquet"):
+        """Export data to zstd-compressed Parquet files"""
+        df_posts = self._load_posts_frame()
+        df_posts.to_parquet(posts_filename, engine='pyarrow', compression='zstd', index=False)
+        print(f"Exported {len(df_posts)} posts to {posts_filename}")
+        
+        df_comments = self._load_comments_frame()
+        df_comments.to_parquet(comments_filename, engine='pyarrow', compression='zstd', index=False)
+        print(f"Exported {len(df_comments)} comments to {comments_filename}")
     
     def generate_report(self, filename: str = "scraping_report.txt"):
         """Generate a comprehensive text report"""
@@ -378,7 +541,7 @@ Most Active Months (Top 5):
 """
         
         # Add temporal data
-        sorted_months = sorted(temporal['monthly_posts'].items(), key=lambda x: x[1], reverse=True)[:5]
+        sorted_months = nlargest(5, temporal['monthly_posts'].items(), key=itemgetter(1))
         for month, count in sorted_months:
             report += f"  {month}: {count:,} posts\n"
         
@@ -426,8 +589,9 @@ Most Active Months (Top 5):
         print(f"Coverage: {overview['coverage_percentage']:.1f}%")
     
     def close(self):
-        """Close database connection"""
+        """Close database connections"""
         self.conn.close()
+        self.cache_conn.close()
 
 def main():
     """Main function for the data analyzer"""
@@ -442,6 +606,7 @@ def main():
         print("\nExporting data...")
         analyzer.export_to_json()
         analyzer.export_to_csv()
+        analyzer.export_to_parquet()
         
         print("\nAnalysis complete!")
         
@@ -5,81 +5,228 @@ Data Pipeline Orchestrator
 Manages the flow from Reddit scraping → LLM processing → RAG preparation
 """
 
+import os
 import sqlite3
-import json
+import orjson
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Any
+from itertools import groupby, repeat
+from multiprocessing import get_context
+from operator import itemgetter
+from typing import Dict, Iterator, List, Any, Optional, Tuple
+from urllib.request import pathname2url
 import logging
 
+# Posts per worker task in parallel LLM exports; stays under SQLite's
+# default limit of 999 bound parameters per statement
+EXPORT_CHUNK_SIZE = 500
+
 class DataPipelineOrchestrator:
     """Orchestrates data flow through the entire pipeline"""
     
     def __init__(self, sqlite_db: str = "reddit_data.db"):
         self.sqlite_db = sqlite_db
         self.logger = logging.getLogger(__name__)
+        
+        # One connection for the lifetime of the orchestrator
+        self.conn = sqlite3.connect(sqlite_db, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        
+        # Tune the connection for read-heavy exports; these settings are local to
+        # the connection, so opening the orchestrator never writes to the database
+        self.conn.executescript('''
+            PRAGMA temp_store=MEMORY;
+            PRAGMA cache_size=-262144;
+            PRAGMA mmap_size=1073741824;
+        ''')
+        self._schema_prepared = False
     
-    def export_for_llm_processing(self, output_file: str = "llm_input.json") -> Dict:
-        """Export scraped data in optimal format for LLM theme analysis"""
+    def _prepare_schema(self):
+        """Index and migrate the comments table before the first export, then stop writing"""
+        if self._schema_prepared:
+            return
+        self._schema_prepared = True
         
-        conn = sqlite3.connect(self.sqlite_db)
-        cursor = conn.cursor()
+        cursor = self.conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'comments'")
+        if cursor.fetchone():
+            try:
+                self.conn.execute('CREATE INDEX IF NOT EXISTS idx_comments_post_created ON comments(post_id, created_utc)')
+                self._ensure_comment_parent_columns()
+            except sqlite3.OperationalError as e:
+                # e.g. a read-only database: export with the schema as it is
+                if self.conn.in_transaction:
+                    self.conn.rollback()
+                self.logger.warning(f"Could not prepare comments table for export: {e}")
         
-        # Get all posts with their comments in hierarchical structure
-        cursor.execute('SELECT * FROM posts ORDER BY created_utc DESC')
-        posts = cursor.fetchall()
-        
-        llm_ready_data = []
-        
-        for post_row in posts:
-            post_data = {
-                "post_id": post_row[0],
-                "title": post_row[1],
-                "content": post_row[2],
-                "author": post_row[3],
-                "created_utc": post_row[4],
-                "score": post_row[5],
-                "num_comments": post_row[6],
-                "url": post_row[7],
-                "subreddit": post_row[9],
-                "comment_tree": self._build_comment_tree(post_row[0])
-            }
-            llm_ready_data.append(post_data)
+        # All writes happen above; everything after this point only reads
+        self.conn.execute('PRAGMA query_only=1')
+    
+    def _ensure_comment_parent_columns(self):
+        """Add and backfill is_top_level/parent_comment_id on databases scraped before they existed"""
+        columns = {row['name'] for row in self.conn.execute('PRAGMA table_info(comments)')}
+        if 'is_top_level' in columns:
+            return
+        
+        self.conn.executescript('''
+            BEGIN;
+            ALTER TABLE comments ADD COLUMN is_top_level BOOLEAN;
+            ALTER TABLE comments ADD COLUMN parent_comment_id TEXT;
+            UPDATE comments SET
+                is_top_level = substr(parent_id, 1, 3) = 't3_',
+                parent_comment_id = CASE WHEN substr(parent_id, 1, 3) = 't1_'
+                                         THEN substr(parent_id, 4) END;
+            COMMIT;
+        ''')
+    
+    def export_for_llm_processing(self, output_file: str = "llm_input.json") -> Dict:
+        """
+        Export scraped data in optimal format for LLM theme analysis
+        
+        Returns the full export, which is held in memory; stream_llm_export
+        writes the same file without holding it.
+        """
+        self._prepare_schema()
+        posts = [self._llm_record(post_row, comments) for post_row, comments in self._iter_llm_rows()]
         
-        # Export for LLM processing
         export_data = {
             "metadata": {
                 "export_date": datetime.now().isoformat(),
-                "total_posts": len(llm_ready_data),
+                "total_posts": len(posts),
                 "purpose": "LLM_THEME_ANALYSIS"
             },
-            "posts": llm_ready_data
+            "posts": posts
         }
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False)
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(export_data, option=orjson.OPT_INDENT_2))
         
-        self.logger.info(f"Exported {len(llm_ready_data)} posts for LLM processing: {output_file}")
-        conn.close()
+        self.logger.info(f"Exported {len(posts)} posts for LLM processing: {output_file}")
         return export_data
     
-    def _build_comment_tree(self, post_id: str) -> List[Dict]:
-        """Build hierarchical comment tree for a post"""
-        conn = sqlite3.connect(self.sqlite_db)
-        cursor = conn.cursor()
+    def stream_llm_export(self, output_file: str = "llm_input.json",
+                          max_workers: Optional[int] = None) -> Dict:
+        """
+        Write the export_for_llm_processing file without holding it in memory
+        
+        Posts are written to disk as they are built. By default the export is
+        built in-process; with max_workers > 1, exports larger than one chunk are
+        built in that many worker processes. Returns the export metadata.
+        """
+        self._prepare_schema()
+        
+        # One read transaction, so the count and the exported posts come from the
+        # same snapshot even while a scrape is writing
+        with self.conn:
+            self.conn.execute('BEGIN')
+            
+            cursor = self.conn.cursor()
+            cursor.execute('SELECT COUNT(*) FROM posts')
+            metadata = {
+                "export_date": datetime.now().isoformat(),
+                "total_posts": cursor.fetchone()[0],
+                "purpose": "LLM_THEME_ANALYSIS"
+            }
+            
+            if max_workers and max_workers > 1 and metadata["total_posts"] > EXPORT_CHUNK_SIZE:
+                records = self._iter_llm_records_parallel(max_workers)
+            else:
+                records = self._iter_llm_records()
+            
+            # Laid out as export_for_llm_processing writes it: the metadata object is
+            # reopened and each post is indented into the "posts" array
+            with open(output_file, 'wb') as f:
+                header = orjson.dumps({'metadata': metadata}, option=orjson.OPT_INDENT_2)
+                f.write(header[:-2] + b',\n  "posts": [')
+                
+                wrote_posts = False
+                for record in records:
+                    f.write(b',\n    ' if wrote_posts else b'\n    ')
+                    f.write(record)
+                    wrote_posts = True
+                
+                f.write(b'\n  ]\n}' if wrote_posts else b']\n}')
+        
+        self.logger.info(f"Exported {metadata['total_posts']} posts for LLM processing: {output_file}")
+        return metadata
+    
+    def _iter_llm_records(self) -> Iterator[bytes]:
+        """Yield serialized LLM records for every post, newest first, in-process"""
+        for post_row, comments in self._iter_llm_rows():
+            yield _dump_llm_record(self._llm_record(post_row, comments))
+    
+    def _iter_llm_rows(self) -> Iterator[Tuple[sqlite3.Row, List[sqlite3.Row]]]:
+        """Yield every post row, newest first, with the list of its comment rows"""
+        post_cursor = self.conn.cursor()
+        comment_cursor = self.conn.cursor()
         
-        # Get all comments for this post
-        cursor.execute('''
-            SELECT id, parent_id, body, author, created_utc, score, depth
-            FROM comments 
-            WHERE post_id = ? 
-            ORDER BY created_utc
-        ''', (post_id,))
+        # Stream comments in the same order as posts, grouped per post
+        comment_cursor.execute('''
+            SELECT c.id, c.parent_id, c.body, c.author, c.created_utc, c.score, c.depth,
+                   c.is_top_level, c.parent_comment_id, c.post_id
+            FROM comments c
+            JOIN posts p ON p.id = c.post_id
+            ORDER BY p.created_utc DESC, p.id, c.created_utc, c.depth
+        ''')
+        comment_groups = groupby(comment_cursor, key=itemgetter('post_id'))
+        next_group = next(comment_groups, None)
         
-        comments = cursor.fetchall()
+        # Get all posts with their comments in hierarchical structure
+        post_cursor.execute('SELECT * FROM posts ORDER BY created_utc DESC, id')
+        
+        for post_row in post_cursor:
+            comments = []
+            if next_group is not None and next_group[0] == post_row['id']:
+                comments = list(next_group[1])
+                next_group = next(comment_groups, None)
+            
+            yield post_row, comments
+    
+    def _iter_llm_records_parallel(self, max_workers: int) -> Iterator[bytes]:
+        """
+        Yield serialized LLM records for every post, newest first, built by worker processes
+        
+        Must run inside a read transaction. Workers read on their own connections,
+        so they only take comments up to this snapshot's highest rowid (comments
+        are insert-only), matching the post IDs listed here.
+        """
+        cursor = self.conn.cursor()
+        cursor.execute('SELECT MAX(rowid) FROM comments')
+        max_comment_rowid = cursor.fetchone()[0] or 0
+        
+        cursor.execute('SELECT id FROM posts ORDER BY created_utc DESC, id')
+        chunks = iter(lambda: [row[0] for row in cursor.fetchmany(EXPORT_CHUNK_SIZE)], [])
+        
+        # Spawned rather than forked, so workers don't inherit the open connection;
+        # map() yields chunk results in submission order, preserving post order
+        with ProcessPoolExecutor(max_workers=max_workers, mp_context=get_context('spawn')) as executor:
+            for records in executor.map(_export_post_chunk, repeat(self.sqlite_db),
+                                        repeat(max_comment_rowid), chunks):
+                yield from records
+    
+    @staticmethod
+    def _llm_record(post_row: sqlite3.Row, comments: List[sqlite3.Row]) -> Dict:
+        """Build the LLM export record for a post and its comment rows"""
+        return {
+            "post_id": post_row['id'],
+            "title": post_row['title'],
+            "content": post_row['selftext'],
+            "author": post_row['author'],
+            "created_utc": post_row['created_utc'],
+            "score": post_row['score'],
+            "num_comments": post_row['num_comments'],
+            "url": post_row['url'],
+            "subreddit": post_row['subreddit'],
+            "comment_tree": DataPipelineOrchestrator._build_comment_tree_from_rows(comments)
+        }
+    
+    @staticmethod
+    def _build_comment_tree_from_rows(comments: List[sqlite3.Row]) -> List[Dict]:
+        """Build hierarchical comment tree from a post's comment rows"""
         comment_dict = {}
         root_comments = []
         
-        # Build comment objects
+        # Rows are ordered by (created_utc, depth), so a parent is always seen
+        # before its replies and every comment can be linked in a single pass
         for comment in comments:
             comment_obj = {
                 "id": comment[0],
@@ -92,28 +239,22 @@ class DataPipelineOrchestrator:
                 "replies": []
             }
             comment_dict[comment[0]] = comment_obj
-        
-        # Build hierarchy
-        for comment in comments:
-            comment_id = comment[0]
-            parent_id = comment[1]
             
-            if parent_id.startswith('t3_'):  # Top-level comment (parent is post)
-                root_comments.append(comment_dict[comment_id])
+            if comment['is_top_level']:  # Top-level comment (parent is post)
+                root_comments.append(comment_obj)
             else:
                 # Find parent comment and add as reply
-                parent_comment_id = parent_id.replace('t1_', '')
-                if parent_comment_id in comment_dict:
-                    comment_dict[parent_comment_id]["replies"].append(comment_dict[comment_id])
+                parent_comment = comment_dict.get(comment['parent_comment_id'])
+                if parent_comment is not None:
+                    parent_comment["replies"].append(comment_obj)
         
-        conn.close()
         return root_comments
     
     def prepare_for_rag_system(self, llm_results_file: str, output_file: str = "rag_ready.json"):
         """Prepare LLM-analyzed data for RAG system and dashboard"""
         
-        with open(llm_results_file, 'r') as f:
-            llm_data = json.load(f)
+        with open(llm_results_file, 'rb') as f:
+            llm_data = orjson.loads(f.read())
         
         rag_ready_documents = []
         
@@ -150,8 +291,8 @@ class DataPipelineOrchestrator:
             "documents": rag_ready_documents
         }
         
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(rag_export, f, indent=2, ensure_ascii=False)
+        with open(output_file, 'wb') as f:
+            f.write(orjson.dumps(rag_export, option=orjson.OPT_INDENT_2))
         
         self.logger.info(f"Prepared {len(rag_ready_documents)} documents for RAG system: {output_file}")
         return rag_export
@@ -163,20 +304,56 @@ class DataPipelineOrchestrator:
             f"Content: {post['content']}"
         ]
         
-        # Add comments
-        def extract_comment_text(comments, depth=0):
-            text_parts = []
-            for comment in comments:
-                text_parts.append(f"Comment: {comment['content']}")
-                # Recursively add replies
-                if comment.get('replies'):
-                    text_parts.extend(extract_comment_text(comment['replies'], depth + 1))
-            return text_parts
-        
-        if post.get('comment_tree'):
-            content_parts.extend(extract_comment_text(post['comment_tree']))
+        # Add comments depth-first, using an explicit stack instead of recursion
+        stack = list(reversed(post.get('comment_tree') or []))
+        while stack:
+            comment = stack.pop()
+            content_parts.append(f"Comment: {comment['content']}")
+            if comment.get('replies'):
+                stack.extend(reversed(comment['replies']))
         
         return "\n".join(content_parts)
+    
+    def close(self):
+        """Close database connection"""
+        self.conn.close()
+
+def _dump_llm_record(record: Dict) -> bytes:
+    """Serialize an LLM record indented to its place in the export's "posts" array"""
+    return orjson.dumps(record, option=orjson.OPT_INDENT_2).replace(b'\n', b'\n    ')
+
+def _export_post_chunk(sqlite_db: str, max_comment_rowid: int, post_ids: List[str]) -> List[bytes]:
+    """Worker process entry point: serialize LLM records for a chunk of posts, in the given order"""
+    db_uri = f"file:{pathname2url(os.path.abspath(sqlite_db))}?mode=ro"
+    conn = sqlite3.connect(db_uri, uri=True, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    
+    try:
+        # Both queries read one snapshot; comments newer than the parent's are skipped
+        conn.execute('BEGIN')
+        placeholders = ','.join('?' * len(post_ids))
+        
+        cursor = conn.execute(f'''
+            SELECT id, parent_id, body, author, created_utc, score, depth,
+                   is_top_level, parent_comment_id, post_id
+            FROM comments
+            WHERE post_id IN ({placeholders}) AND rowid <= ?
+            ORDER BY post_id, created_utc, depth
+        ''', (*post_ids, max_comment_rowid))
+        comments_by_post = {
+            post_id: list(rows)
+            for post_id, rows in groupby(cursor, key=itemgetter('post_id'))
+        }
+        
+        cursor = conn.execute(f'SELECT * FROM posts WHERE id IN ({placeholders})', post_ids)
+        posts = {row['id']: row for row in cursor}
+        
+        return [
+            _dump_llm_record(DataPipelineOrchestrator._llm_record(posts[post_id], comments_by_post.get(post_id, [])))
+            for post_id in post_ids
+        ]
+    finally:
+        conn.close()
 
 def main():
     """Demo the pipeline orchestration"""
@@ -184,7 +361,8 @@ def main():
     
     # Step 1: Export for LLM processing
     print("🔄 Exporting data for LLM theme analysis...")
-    orchestrator.export_for_llm_processing("llm_input.json")
+    orchestrator.stream_llm_export("llm_input.json")
+    orchestrator.close()
     
     print("📝 Next steps:")
     print("1. Process llm_input.json with your LLM for theme analysis")
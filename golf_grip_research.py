@@ -9,6 +9,7 @@ This script uses comprehensive keyword coverage to ensure no relevant posts are
 
 import os
 import logging
+from itertools import chain
 from dotenv import load_dotenv
 from reddit_scraper import RedditScraper
 from quick_start import QuickRedditScraper
@@ -20,67 +21,70 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Golf grip keyword groups, defined once at import rather than per research call
+
+# Core grip terms
+CORE_TERMS = [
+    "grip", "grips", "regrip", "re-grip", "grip change", "changed grips", 
+    "new grips", "grip installation", "grip fitting"
+]
+
+# Size-related terms
+SIZE_TERMS = [
+    "larger grip", "bigger grip", "oversized grip", "jumbo grip", "thick grip",
+    "grip size", "midsize grip", "standard grip", "grip diameter",
+    "oversized", "jumbo", "midsize", "thick grips", "fat grips"
+]
+
+# Brand names (especially those known for larger grips)
+BRAND_TERMS = [
+    "Golf Pride", "Lamkin", "Winn", "JumboMax", "Karma", "Iomic",
+    "SuperStroke", "Tacki-Mac", "Avon", "Loudmouth"
+]
+
+# Performance and feel terms
+PERFORMANCE_TERMS = [
+    "grip feel", "grip comfort", "hand size", "grip pressure",
+    "swing feel", "grip feedback", "grip texture", "grip performance"
+]
+
+# Health/comfort related (older golfers, arthritis, etc.)
+HEALTH_TERMS = [
+    "arthritis", "joint pain", "hand pain", "comfortable grip",
+    "grip for seniors", "senior golfers", "older golfer"
+]
+
+# Equipment discussion terms
+EQUIPMENT_TERMS = [
+    "equipment change", "club modification", "custom grips",
+    "club fitting", "grip recommendation", "grip advice"
+]
+
+# Community discussion phrases
+DISCUSSION_TERMS = [
+    "anyone try", "anyone using", "experience with", "tried larger",
+    "switched to", "thinking about", "considering", "recommendation",
+    "review", "thoughts on", "opinion on"
+]
+
+# Technical terms
+TECHNICAL_TERMS = [
+    "grip tape", "grip solvent", "grip core", "grip weight",
+    "swing weight", "club balance", "grip installation"
+]
+
+# All terms, without duplicates, in the order above
+GOLF_GRIP_KEYWORDS = tuple(dict.fromkeys(chain(
+    CORE_TERMS, SIZE_TERMS, BRAND_TERMS, PERFORMANCE_TERMS,
+    HEALTH_TERMS, EQUIPMENT_TERMS, DISCUSSION_TERMS, TECHNICAL_TERMS
+)))
+
 def get_golf_grip_keywords():
     """
     Comprehensive keyword list for golf grip trend research
     Covers all possible ways people might discuss larger/oversized grips
     """
-    
-    # Core grip terms
-    core_terms = [
-        "grip", "grips", "regrip", "re-grip", "grip change", "changed grips", 
-        "new grips", "grip installation", "grip fitting"
-    ]
-    
-    # Size-related terms
-    size_terms = [
-        "larger grip", "bigger grip", "oversized grip", "jumbo grip", "thick grip",
-        "grip size", "midsize grip", "standard grip", "grip diameter",
-        "oversized", "jumbo", "midsize", "thick grips", "fat grips"
-    ]
-    
-    # Brand names (especially those known for larger grips)
-    brand_terms = [
-        "Golf Pride", "Lamkin", "Winn", "JumboMax", "Karma", "Iomic",
-        "SuperStroke", "Tacki-Mac", "Avon", "Loudmouth"
-    ]
-    
-    # Performance and feel terms
-    performance_terms = [
-        "grip feel", "grip comfort", "hand size", "grip pressure",
-        "swing feel", "grip feedback", "grip texture", "grip performance"
-    ]
-    
-    # Health/comfort related (older golfers, arthritis, etc.)
-    health_terms = [
-        "arthritis", "joint pain", "hand pain", "comfortable grip",
-        "grip for seniors", "senior golfers", "older golfer"
-    ]
-    
-    # Equipment discussion terms
-    equipment_terms = [
-        "equipment change", "club modification", "custom grips",
-        "club fitting", "grip recommendation", "grip advice"
-    ]
-    
-    # Community discussion phrases
-    discussion_terms = [
-        "anyone try", "anyone using", "experience with", "tried larger",
-        "switched to", "thinking about", "considering", "recommendation",
-        "review", "thoughts on", "opinion on"
-    ]
-    
-    # Technical terms
-    technical_terms = [
-        "grip tape", "grip solvent", "grip core", "grip weight",
-        "swing weight", "club balance", "grip installation"
-    ]
-    
-    # Combine all terms
-    all_keywords = (core_terms + size_terms + brand_terms + performance_terms + 
-                   health_terms + equipment_terms + discussion_terms + technical_terms)
-    
-    return list(set(all_keywords))  # Remove duplicates
+    return list(GOLF_GRIP_KEYWORDS)
 
 def research_golf_grips_comprehensive(subreddit_name="golf"):
     """
@@ -188,7 +192,7 @@ def research_golf_grips_quick_test(subreddit_name="golf"):
     print(f"\n🧪 TEST RESULTS: {total_posts} posts found")
     print(f"Sample of posts found:")
     for i, post in enumerate(scraper.posts_data[:5]):
-        print(f"{i+1}. {post['title'][:80]}...")
+        print(f"{i+1}. {post.title[:80]}...")
     
     # Save test results
     scraper.save_to_json("golf_grip_test_results.json")
@@ -9,27 +9,128 @@ Use this to test your setup before running the full comprehensive scraper.
 
 import praw
 import sqlite3
-import json
-import time
+import gzip
+import orjson
 import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, List
+from heapq import nlargest
+from itertools import chain
+from operator import attrgetter
+from typing import Dict, List, Optional, Tuple
+
+from scraper_common import KeywordFilterMixin, ThreadLocalReddit, author_name
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-class QuickRedditScraper:
+# Concurrent comment fetches in scrape_subreddit_sample, per set of credentials
+COMMENT_FETCH_WORKERS = 8
+
+# Records per transaction when streaming to SQLite
+SQLITE_BATCH_SIZE = 500
+
+# Upserts shared by save_to_sqlite and stream_to_sqlite
+INSERT_POST_SQL = '''
+    INSERT INTO posts 
+    (id, title, selftext, author, created_utc, created_datetime, 
+     score, num_comments, url, permalink, subreddit, upvote_ratio, is_self)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        title = excluded.title, selftext = excluded.selftext,
+        author = excluded.author, created_utc = excluded.created_utc,
+        created_datetime = excluded.created_datetime, score = excluded.score,
+        num_comments = excluded.num_comments, url = excluded.url,
+        permalink = excluded.permalink, subreddit = excluded.subreddit,
+        upvote_ratio = excluded.upvote_ratio, is_self = excluded.is_self
+'''
+
+INSERT_COMMENT_SQL = '''
+    INSERT INTO comments 
+    (id, post_id, body, author, created_utc, created_datetime, score, permalink)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(id) DO UPDATE SET
+        post_id = excluded.post_id, body = excluded.body,
+        author = excluded.author, created_utc = excluded.created_utc,
+        created_datetime = excluded.created_datetime, score = excluded.score,
+        permalink = excluded.permalink
+'''
+
+@dataclass(slots=True)
+class QuickPost:
+    """Data structure for sampled posts"""
+    id: str
+    title: str
+    selftext: str
+    author: str
+    created_utc: float
+    created_datetime: Optional[str]  # Filled in when saving
+    score: int
+    num_comments: int
+    url: str
+    permalink: str
+    subreddit: str
+    upvote_ratio: float
+    is_self: bool
+
+@dataclass(slots=True)
+class QuickComment:
+    """Data structure for sampled comments"""
+    id: str
+    post_id: str
+    body: str
+    author: str
+    created_utc: float
+    created_datetime: Optional[str]  # Filled in when saving
+    score: int
+    permalink: str
+
+class QuickRedditScraper(KeywordFilterMixin):
     """Simplified Reddit scraper for testing and small datasets"""
     
-    def __init__(self, client_id: str, client_secret: str, user_agent: str):
-        self.reddit = praw.Reddit(
-            client_id=client_id,
-            client_secret=client_secret,
-            user_agent=user_agent
-        )
+    def __init__(self, client_id: str, client_secret: str, user_agent: str,
+                 extra_credentials: Optional[List[Dict[str, str]]] = None,
+                 keep_comments: bool = True):
+        """
+        Args:
+            client_id, client_secret, user_agent: Reddit API credentials
+            extra_credentials: Optional further credential dicts (same keys) for other
+                Reddit apps; worker threads are spread across all of them, and since
+                Reddit rate-limits per app, each one adds its own request budget
+            keep_comments: Whether to keep scraped comments in comments_data. For large
+                runs, pass False and stream comments to disk with stream_to_jsonl() or
+                stream_to_sqlite() so memory doesn't grow with the comment count
+        """
+        self.credentials = {
+            'client_id': client_id,
+            'client_secret': client_secret,
+            'user_agent': user_agent
+        }
+        self.reddit = praw.Reddit(**self.credentials)
+        
+        # Worker threads each get their own Reddit instance, cycling through the credentials
+        self.credential_pool = [self.credentials, *(extra_credentials or [])]
+        self._thread_reddits = ThreadLocalReddit(self.credential_pool)
+        self._author_names = {}
+        
+        # IDs of posts already scraped, so repeated or overlapping scrapes skip them
+        self._seen_post_ids = set()
+        self._seen_lock = threading.Lock()
         self.posts_data = []
         self.comments_data = []
+        self.keep_comments = keep_comments
+        self.total_comments = 0
+        
+        # Optional JSONL files and SQLite database records are written to as they are scraped
+        self._posts_stream = None
+        self._comments_stream = None
+        self._sqlite_stream = None
+        self._sqlite_batch_size = SQLITE_BATCH_SIZE
+        self._pending_posts = []
+        self._pending_comments = []
         
         # Keyword filtering
         self.keywords = []
@@ -37,56 +138,19 @@ class QuickRedditScraper:
         self.case_sensitive = False
         self.search_in_content = True
     
-    def set_keyword_filter(self, keywords: list, mode: str = 'include_only', 
-                          case_sensitive: bool = False, search_in_content: bool = True):
+    def scrape_subreddit_sample(self, subreddit_name: str, limit: int = 100,
+                                fetch_comments: bool = True, min_comments: int = 1,
+                                min_score: Optional[int] = None):
         """
-        Set keyword filtering options
+        Scrape a sample of posts from a subreddit
         
         Args:
-            keywords: List of keywords to filter by
-            mode: 'include_only' (only posts with keywords), 'exclude' (posts without keywords), 'disabled' (no filtering)
-            case_sensitive: Whether keyword matching should be case sensitive
-            search_in_content: Whether to search in post content (selftext) in addition to title
+            subreddit_name: Name of the subreddit to scrape
+            limit: Number of hot posts to check
+            fetch_comments: Whether to fetch comments at all (one request per post)
+            min_comments: Only fetch comments for posts with at least this many
+            min_score: Only fetch comments for posts scoring at least this much
         """
-        self.keywords = [k.lower() if not case_sensitive else k for k in keywords]
-        self.keyword_mode = mode
-        self.case_sensitive = case_sensitive
-        self.search_in_content = search_in_content
-        
-        logger.info(f"Keyword filter set: mode={mode}, keywords={keywords}, case_sensitive={case_sensitive}")
-    
-    def _matches_keywords(self, post) -> bool:
-        """Check if a post matches the current keyword filter"""
-        if self.keyword_mode == 'disabled' or not self.keywords:
-            return True
-        
-        # Prepare text to search in
-        title = post.title if self.case_sensitive else post.title.lower()
-        content = ''
-        
-        if self.search_in_content and hasattr(post, 'selftext'):
-            content = getattr(post, 'selftext', '') 
-            content = content if self.case_sensitive else content.lower()
-        
-        search_text = f"{title} {content}".strip()
-        
-        # Check for keyword matches
-        matches_any_keyword = False
-        for keyword in self.keywords:
-            if keyword in search_text:
-                matches_any_keyword = True
-                break
-        
-        # Apply filtering logic based on mode
-        if self.keyword_mode == 'include_only':
-            return matches_any_keyword
-        elif self.keyword_mode == 'exclude':
-            return not matches_any_keyword
-        
-        return True
-
-    def scrape_subreddit_sample(self, subreddit_name: str, limit: int = 100):
-        """Scrape a sample of posts from a subreddit"""
         logger.info(f"Starting sample scrape of r/{subreddit_name} (limit: {limit})")
         if self.keyword_mode != 'disabled':
             logger.info(f"Keyword filtering active: {self.keyword_mode} - {self.keywords}")
@@ -94,107 +158,287 @@ class QuickRedditScraper:
         try:
             subreddit = self.reddit.subreddit(subreddit_name)
             
-            # Test connectivity
             logger.info(f"Subreddit: {subreddit.display_name}")
-            logger.info(f"Subscribers: {subreddit.subscribers:,}")
             
-            # Scrape hot posts
+            # Reading subscribers costs an extra /about request, so only do it when it's logged
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Subscribers: {subreddit.subscribers:,}")
+            
+            # Scrape hot posts; comment trees download in worker threads while
+            # the listing is still being paged
             logger.info("Scraping hot posts...")
-            for post in subreddit.hot(limit=limit):
-                # Apply keyword filter
-                if not self._matches_keywords(post):
-                    continue
-                    
-                post_data = self._process_post(post)
-                if post_data:
-                    self.posts_data.append(post_data)
-                    
-                    # Get some comments for each post
-                    if post.num_comments > 0:
-                        self._process_post_comments(post, max_comments=10)
+            max_workers = COMMENT_FETCH_WORKERS * len(self.credential_pool)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                comment_futures = []
+                for post in subreddit.hot(limit=limit):
+                    # Apply keyword filter, and skip posts an earlier scrape already found
+                    if not self._matches_keywords(post) or not self._claim_post(post.id):
+                        continue
+                        
+                    post_data = self._process_post(post)
+                    if post_data:
+                        self._add_post(post_data)
+                        
+                        # Get some comments for each post worth a comment request
+                        if (fetch_comments and post.num_comments >= max(min_comments, 1)
+                                and (min_score is None or post.score >= min_score)):
+                            comment_futures.append(executor.submit(self._fetch_post_comments, post.id))
                 
-                # Simple rate limiting
-                time.sleep(0.5)
+                # Collect comments in listing order
+                for future in comment_futures:
+                    self._add_comments(future.result())
             
-            logger.info(f"Scraped {len(self.posts_data)} posts and {len(self.comments_data)} comments")
+            logger.info(f"Scraped {len(self.posts_data)} posts and {self.total_comments} comments")
             
         except Exception as e:
             logger.error(f"Error scraping: {e}")
             raise
     
-    def _process_post(self, post) -> Dict:
+    def _claim_post(self, post_id: str) -> bool:
+        """Mark a post as scraped; returns False if this scraper already has it"""
+        with self._seen_lock:
+            if post_id in self._seen_post_ids:
+                return False
+            self._seen_post_ids.add(post_id)
+            return True
+    
+    def _process_post(self, post) -> Optional[QuickPost]:
         """Process a single post"""
         try:
-            return {
-                'id': post.id,
-                'title': post.title,
-                'selftext': getattr(post, 'selftext', ''),
-                'author': post.author.name if post.author else '[deleted]',
-                'created_utc': post.created_utc,
-                'created_datetime': datetime.fromtimestamp(post.created_utc).isoformat(),
-                'score': post.score,
-                'num_comments': post.num_comments,
-                'url': post.url,
-                'permalink': post.permalink,
-                'subreddit': post.subreddit.display_name,
-                'upvote_ratio': getattr(post, 'upvote_ratio', 0.0),
-                'is_self': post.is_self
-            }
+            # Read optional fields from the listing data: getattr() on a field the
+            # listing omitted makes PRAW fetch the whole post
+            listing_data = vars(post)
+            return QuickPost(
+                id=post.id,
+                title=post.title,
+                selftext=listing_data.get('selftext', ''),
+                author=self._author_name(post),
+                created_utc=post.created_utc,
+                created_datetime=None,
+                score=post.score,
+                num_comments=post.num_comments,
+                url=post.url,
+                permalink=post.permalink,
+                subreddit=post.subreddit.display_name,
+                upvote_ratio=listing_data.get('upvote_ratio', 0.0),
+                is_self=post.is_self
+            )
         except Exception as e:
             logger.error(f"Error processing post {post.id}: {e}")
             return None
     
-    def _process_post_comments(self, post, max_comments: int = 10):
-        """Process comments for a post"""
+    def _author_name(self, item) -> str:
+        """Author name from the listing data, without lazily loading the Redditor"""
+        name = author_name(item)
+        # Share one string per author across all of their posts and comments
+        return self._author_names.setdefault(name, name)
+    
+    def _fetch_post_comments(self, post_id: str, max_comments: int = 10) -> List[QuickComment]:
+        """Worker thread entry point: fetch and process comments for a post by ID"""
+        return self._collect_post_comments(self._thread_reddits.get().submission(id=post_id), max_comments)
+    
+    def _collect_post_comments(self, post, max_comments: int = 10) -> List[QuickComment]:
+        """Build comment records for a post's top-level comments"""
+        comments = []
         try:
+            # The first page of the comment tree is one request; limit=0 only drops
+            # the "load more" stubs without expanding them, so no further requests
             post.comments.replace_more(limit=0)  # Get top-level comments only
             
-            comment_count = 0
             for comment in post.comments[:max_comments]:
                 if hasattr(comment, 'body') and comment.body != '[deleted]':
-                    comment_data = {
-                        'id': comment.id,
-                        'post_id': post.id,
-                        'body': comment.body,
-                        'author': comment.author.name if comment.author else '[deleted]',
-                        'created_utc': comment.created_utc,
-                        'created_datetime': datetime.fromtimestamp(comment.created_utc).isoformat(),
-                        'score': comment.score,
-                        'permalink': comment.permalink
-                    }
-                    self.comments_data.append(comment_data)
-                    comment_count += 1
+                    comment_data = QuickComment(
+                        id=comment.id,
+                        post_id=post.id,
+                        body=comment.body,
+                        author=self._author_name(comment),
+                        created_utc=comment.created_utc,
+                        created_datetime=None,
+                        score=comment.score,
+                        permalink=comment.permalink
+                    )
+                    comments.append(comment_data)
             
-            if comment_count > 0:
-                logger.info(f"Scraped {comment_count} comments for post {post.id}")
+            if comments:
+                logger.info(f"Scraped {len(comments)} comments for post {post.id}")
                 
         except Exception as e:
             logger.error(f"Error processing comments for post {post.id}: {e}")
+        
+        return comments
+    
+    def stream_to_jsonl(self, posts_file: str = "quick_scrape_posts.jsonl",
+                        comments_file: str = "quick_scrape_comments.jsonl"):
+        """
+        Append every post and comment to JSONL files as soon as it is scraped
+        
+        Records written so far survive a crash or an interrupted run. The files
+        are opened in append mode, so repeated runs accumulate; call close() when done.
+        """
+        self._close_jsonl_streams()
+        self._posts_stream = open(posts_file, 'ab')
+        self._comments_stream = open(comments_file, 'ab')
+        logger.info(f"Streaming records to {posts_file} and {comments_file}")
+    
+    def stream_to_sqlite(self, filename: str = "quick_scrape_results.db",
+                         batch_size: int = SQLITE_BATCH_SIZE):
+        """
+        Write every post and comment to a SQLite database while scraping
+        
+        Records are inserted batch_size at a time, each batch committed in one
+        transaction; call close() when done to write the final partial batch.
+        """
+        self._close_sqlite_stream()
+        self._sqlite_stream = self._open_sqlite(filename)
+        self._sqlite_batch_size = batch_size
+        logger.info(f"Streaming records to {filename}")
+    
+    def _add_post(self, post_data: QuickPost):
+        """Record a scraped post"""
+        self.posts_data.append(post_data)
+        self._write_records(self._posts_stream, [post_data])
+        if self._sqlite_stream is not None:
+            self._pending_posts.append(post_data)
+            self._flush_sqlite_stream(force=False)
+    
+    def _add_comments(self, comments: List[QuickComment]):
+        """Record a post's scraped comments"""
+        self.total_comments += len(comments)
+        if self.keep_comments:
+            self.comments_data.extend(comments)
+        self._write_records(self._comments_stream, comments)
+        if self._sqlite_stream is not None:
+            self._pending_comments.extend(comments)
+            self._flush_sqlite_stream(force=False)
+    
+    def _flush_sqlite_stream(self, force: bool = True):
+        """Insert pending records once a full batch has built up (or always, with force)"""
+        pending = len(self._pending_posts) + len(self._pending_comments)
+        if not pending or (not force and pending < self._sqlite_batch_size):
+            return
+        with self._sqlite_stream:
+            self._sqlite_stream.execute('BEGIN')
+            self._insert_posts(self._sqlite_stream, self._pending_posts)
+            self._insert_comments(self._sqlite_stream, self._pending_comments)
+        self._pending_posts.clear()
+        self._pending_comments.clear()
+    
+    def _close_jsonl_streams(self):
+        """Flush and close the JSONL streams"""
+        for stream in (self._posts_stream, self._comments_stream):
+            if stream is not None:
+                stream.close()
+        self._posts_stream = self._comments_stream = None
+    
+    def _close_sqlite_stream(self):
+        """Write any pending records and close the SQLite stream"""
+        if self._sqlite_stream is not None:
+            self._flush_sqlite_stream()
+            self._sqlite_stream.close()
+            self._sqlite_stream = None
+    
+    @staticmethod
+    def _write_records(stream, records):
+        """Append records to a JSONL stream, if streaming is enabled"""
+        if stream is None or not records:
+            return
+        for record in records:
+            QuickRedditScraper._fill_created_datetime(record)
+            stream.write(orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE))
+        stream.flush()
     
-    def save_to_json(self, filename: str = "quick_scrape_results.json"):
-        """Save results to JSON file"""
-        data = {
-            'metadata': {
-                'scrape_date': datetime.now().isoformat(),
-                'total_posts': len(self.posts_data),
-                'total_comments': len(self.comments_data)
-            },
-            'posts': self.posts_data,
-            'comments': self.comments_data
+    @staticmethod
+    def _fill_created_datetime(record) -> str:
+        """Format a record's created_datetime if it doesn't have it yet, and return it"""
+        if record.created_datetime is None:
+            record.created_datetime = datetime.fromtimestamp(record.created_utc).isoformat()
+        return record.created_datetime
+    
+    def _fill_created_datetimes(self):
+        """Format created_datetime for records that don't have it yet, once per record"""
+        for record in chain(self.posts_data, self.comments_data):
+            self._fill_created_datetime(record)
+    
+    def save_to_json(self, filename: str = "quick_scrape_results.json", compress: bool = False):
+        """
+        Save results to JSON file
+        
+        With compress=True the output is gzipped to filename + '.gz'; Reddit text
+        compresses several times over, at little CPU cost with a low compression level.
+        Records are encoded and written one at a time, so the whole document is
+        never held in memory as a single string.
+        """
+        self._fill_created_datetimes()
+        metadata = {
+            'scrape_date': datetime.now().isoformat(),
+            'total_posts': len(self.posts_data),
+            'total_comments': len(self.comments_data)
         }
+        if not self.keep_comments:
+            # Comments went to the streams instead of this file; still report how many
+            metadata['comments_scraped'] = self.total_comments
+        
+        if compress:
+            filename += '.gz'
+            f = gzip.open(filename, 'wb', compresslevel=3)
+        else:
+            f = open(filename, 'wb')
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        # Same layout as dumping {metadata, posts, comments} with OPT_INDENT_2
+        with f:
+            f.write(b'{\n  "metadata": ')
+            f.write(orjson.dumps(metadata, option=orjson.OPT_INDENT_2).replace(b'\n', b'\n  '))
+            f.write(b',\n  "posts": ')
+            self._write_json_array(f, self.posts_data, indent=2)
+            f.write(b',\n  "comments": ')
+            self._write_json_array(f, self.comments_data, indent=2)
+            f.write(b'\n}')
         
         logger.info(f"Saved results to {filename}")
     
+    @staticmethod
+    def _write_json_array(f, records, indent: int):
+        """Write records as an indented JSON array nested `indent` spaces deep"""
+        if not records:
+            f.write(b'[]')
+            return
+        
+        # Strings never contain raw newlines in JSON, so re-indenting each encoded
+        # record is a plain replace
+        item_indent = b'\n' + b' ' * (indent + 2)
+        f.write(b'[')
+        for i, record in enumerate(records):
+            if i:
+                f.write(b',')
+            f.write(item_indent)
+            f.write(orjson.dumps(record, option=orjson.OPT_INDENT_2).replace(b'\n', item_indent))
+        f.write(b'\n' + b' ' * indent + b']')
+    
     def save_to_sqlite(self, filename: str = "quick_scrape_results.db"):
         """Save results to SQLite database"""
-        conn = sqlite3.connect(filename)
-        cursor = conn.cursor()
+        conn = self._open_sqlite(filename)
+        
+        # Insert all rows in one transaction, reusing each prepared statement
+        with conn:
+            conn.execute('BEGIN')
+            self._insert_posts(conn, self.posts_data)
+            self._insert_comments(conn, self.comments_data)
+        
+        conn.close()
+        logger.info(f"Saved results to {filename}")
+    
+    @staticmethod
+    def _open_sqlite(filename: str) -> sqlite3.Connection:
+        """Open a results database, creating its tables if needed; transactions are explicit"""
+        conn = sqlite3.connect(filename, isolation_level=None)
+        conn.executescript('''
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+        ''')
         
-        # Create tables
-        cursor.execute('''
+        # Create tables in a single script
+        conn.executescript('''
             CREATE TABLE IF NOT EXISTS posts (
                 id TEXT PRIMARY KEY,
                 title TEXT,
@@ -209,10 +453,8 @@ class QuickRedditScraper:
                 subreddit TEXT,
                 upvote_ratio REAL,
                 is_self BOOLEAN
-            )
-        ''')
-        
-        cursor.execute('''
+            );
+            
             CREATE TABLE IF NOT EXISTS comments (
                 id TEXT PRIMARY KEY,
                 post_id TEXT,
@@ -223,38 +465,35 @@ class QuickRedditScraper:
                 score INTEGER,
                 permalink TEXT,
                 FOREIGN KEY (post_id) REFERENCES posts (id)
-            )
+            );
         ''')
+        return conn
+    
+    @staticmethod
+    def _insert_posts(conn: sqlite3.Connection, posts: List[QuickPost]):
+        """
+        Insert or update post rows in the connection's current transaction
         
-        # Insert posts
-        for post in self.posts_data:
-            cursor.execute('''
-                INSERT OR REPLACE INTO posts 
-                (id, title, selftext, author, created_utc, created_datetime, 
-                 score, num_comments, url, permalink, subreddit, upvote_ratio, is_self)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                post['id'], post['title'], post['selftext'], post['author'],
-                post['created_utc'], post['created_datetime'], post['score'],
-                post['num_comments'], post['url'], post['permalink'],
-                post['subreddit'], post['upvote_ratio'], post['is_self']
-            ))
-        
-        # Insert comments
-        for comment in self.comments_data:
-            cursor.execute('''
-                INSERT OR REPLACE INTO comments 
-                (id, post_id, body, author, created_utc, created_datetime, score, permalink)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                comment['id'], comment['post_id'], comment['body'], comment['author'],
-                comment['created_utc'], comment['created_datetime'], 
-                comment['score'], comment['permalink']
-            ))
-        
-        conn.commit()
-        conn.close()
-        logger.info(f"Saved results to {filename}")
+        Upserting updates existing rows in place, where INSERT OR REPLACE would
+        delete and re-insert them.
+        """
+        conn.executemany(INSERT_POST_SQL, (
+            (post.id, post.title, post.selftext, post.author,
+             post.created_utc, QuickRedditScraper._fill_created_datetime(post), post.score,
+             post.num_comments, post.url, post.permalink,
+             post.subreddit, post.upvote_ratio, post.is_self)
+            for post in posts
+        ))
+    
+    @staticmethod
+    def _insert_comments(conn: sqlite3.Connection, comments: List[QuickComment]):
+        """Insert or update comment rows in the connection's current transaction"""
+        conn.executemany(INSERT_COMMENT_SQL, (
+            (comment.id, comment.post_id, comment.body, comment.author,
+             comment.created_utc, QuickRedditScraper._fill_created_datetime(comment), 
+             comment.score, comment.permalink)
+            for comment in comments
+        ))
     
     def print_summary(self):
         """Print a summary of scraped data"""
@@ -262,22 +501,70 @@ class QuickRedditScraper:
         print("QUICK SCRAPE SUMMARY")
         print("="*50)
         print(f"Posts scraped: {len(self.posts_data)}")
-        print(f"Comments scraped: {len(self.comments_data)}")
+        print(f"Comments scraped: {self.total_comments}")
         
         if self.posts_data:
-            scores = [post['score'] for post in self.posts_data]
-            print(f"Average post score: {sum(scores) / len(scores):.1f}")
-            print(f"Highest scoring post: {max(scores)}")
+            # Only the top 3 are shown, so select them instead of sorting every post
+            top_posts = nlargest(3, self.posts_data, key=attrgetter('score'))
+            total_score = sum(post.score for post in self.posts_data)
+            print(f"Average post score: {total_score / len(self.posts_data):.1f}")
+            print(f"Highest scoring post: {top_posts[0].score}")
             
             # Show top 3 posts by score
-            sorted_posts = sorted(self.posts_data, key=lambda x: x['score'], reverse=True)
             print(f"\nTop 3 posts by score:")
-            for i, post in enumerate(sorted_posts[:3], 1):
-                title = post['title'][:60] + "..." if len(post['title']) > 60 else post['title']
-                print(f"{i}. {title} (Score: {post['score']})")
+            for i, post in enumerate(top_posts, 1):
+                title = post.title[:60] + "..." if len(post.title) > 60 else post.title
+                print(f"{i}. {title} (Score: {post.score})")
         
         print("="*50)
 
+    def _search_keyword(self, subreddit_name: str, keyword: str, case_sensitive: bool,
+                        max_posts: int) -> Tuple[List[QuickPost], List[QuickComment]]:
+        """Worker thread entry point: search one keyword, returning its new posts and their comments"""
+        posts, comments = [], []
+        try:
+            logger.info(f"Searching for keyword: '{keyword}'")
+            
+            subreddit = self._thread_reddits.get().subreddit(subreddit_name)
+            search_results = subreddit.search(
+                keyword, 
+                sort='new', 
+                time_filter='all', 
+                limit=max_posts
+            )
+            
+            for post in search_results:
+                # Additional filtering if case sensitive
+                if case_sensitive:
+                    title_text = post.title
+                    content_text = vars(post).get('selftext') or ''
+                    search_text = f"{title_text} {content_text}"
+                    
+                    if keyword not in search_text:
+                        continue
+                
+                # Skip posts another keyword (or an earlier scrape) already found
+                if not self._claim_post(post.id):
+                    continue
+                
+                post_data = self._process_post(post)
+                if post_data:
+                    posts.append(post_data)
+                    
+                    # Get some comments for each post
+                    if post.num_comments > 0:
+                        comments.extend(self._collect_post_comments(post, max_comments=10))
+            
+        except Exception as e:
+            logger.error(f"Error searching for keyword '{keyword}': {e}")
+        
+        return posts, comments
+    
+    def close(self):
+        """Flush and close any open record streams"""
+        self._close_jsonl_streams()
+        self._close_sqlite_stream()
+    
     def scrape_keywords_only(self, subreddit_name: str, keywords: list, 
                            case_sensitive: bool = False, max_posts_per_keyword: int = 100):
         """
@@ -291,48 +578,25 @@ class QuickRedditScraper:
         """
         logger.info(f"Starting keyword-only scrape of r/{subreddit_name} for keywords: {keywords}")
         
-        subreddit = self.reddit.subreddit(subreddit_name)
-        total_posts = 0
+        # Search all keywords concurrently; a post found by several keywords is
+        # only processed (and has its comments fetched) once
+        def search_keyword(keyword):
+            return self._search_keyword(subreddit_name, keyword, case_sensitive, max_posts_per_keyword)
         
-        for keyword in keywords:
-            try:
-                logger.info(f"Searching for keyword: '{keyword}'")
-                
-                search_results = subreddit.search(
-                    keyword, 
-                    sort='new', 
-                    time_filter='all', 
-                    limit=max_posts_per_keyword
-                )
-                
-                keyword_posts = 0
-                for post in search_results:
-                    # Additional filtering if case sensitive
-                    if case_sensitive:
-                        title_text = post.title
-                        content_text = getattr(post, 'selftext', '')
-                        search_text = f"{title_text} {content_text}"
-                        
-                        if keyword not in search_text:
-                            continue
-                    
-                    post_data = self._process_post(post)
-                    if post_data:
-                        self.posts_data.append(post_data)
-                        keyword_posts += 1
-                        total_posts += 1
-                        
-                        # Get some comments for each post
-                        if post.num_comments > 0:
-                            self._process_post_comments(post, max_comments=10)
-                
-                logger.info(f"Keyword '{keyword}': {keyword_posts} posts found")
-                time.sleep(1)  # Rate limiting
-                
-            except Exception as e:
-                logger.error(f"Error searching for keyword '{keyword}': {e}")
+        total_posts = 0
+        max_workers = min(COMMENT_FETCH_WORKERS * len(self.credential_pool), max(len(keywords), 1))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            # Merge results in keyword order
+            for keyword, (posts, comments) in zip(keywords, executor.map(search_keyword, keywords)):
+                for post_data in posts:
+                    self._add_post(post_data)
+                self._add_comments(comments)
+                total_posts += len(posts)
+                logger.info(f"Keyword '{keyword}': {len(posts)} posts found")
         
         logger.info(f"Keyword-only scrape completed: {total_posts} total posts")
+        # PRAW paces requests from Reddit's rate-limit headers; log the remaining budget
+        logger.debug(f"Rate limit status: {self.reddit.auth.limits}")
         return total_posts
 
 def main():
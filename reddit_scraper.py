@@ -7,7 +7,7 @@ A comprehensive pipeline to scrape all posts and comments from a subreddit
 using only the free tier Reddit API with smart workarounds for limitations.
 
 Key Features:
-- Multi-strategy data collection (time-based, sort-based, search-based)
+- Multi-strategy data collection (sort-based, search-based, user-based)
 - Rate limiting and exponential backoff
 - Deduplication across strategies
 - Progress tracking and resume capability
@@ -17,24 +17,33 @@ Key Features:
 import praw
 import prawcore
 import sqlite3
-import json
+import orjson
 import time
 import logging
 import hashlib
+import math
 import requests
 import os
-from datetime import datetime, timedelta
-from typing import List, Dict, Set, Optional, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, Dict, Iterator, Optional
+from itertools import groupby
+from operator import attrgetter, itemgetter
 from dataclasses import dataclass, asdict
-from collections import defaultdict
+from collections import defaultdict, deque
 import random
 import re
 from dotenv import load_dotenv
 
+from scraper_common import KeywordFilterMixin, ThreadLocalReddit, author_name
+
 # Load environment variables from .env file
 load_dotenv()
 
-# Configure logging
+# Configure logging: per-item messages are logged at DEBUG so the INFO
+# progress shown in the terminal stays low-rate
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
@@ -45,7 +54,49 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Posts saved per transaction while walking a listing
+POST_BATCH_SIZE = 500
+
+# Concurrent listing fetches for the search and user strategies
+FETCH_WORKERS = 8
+
+# Items per listing request (PRAW fetches listings 100 at a time)
+LISTING_PAGE_SIZE = 100
+
+# Narrow top listings (day/week/month/year) mostly repeat what hot, new and
+# the earlier top listings already found: once SEEN_CHECK_POSTS posts have
+# been read, stop if at least SEEN_SKIP_FRACTION of them were already known
+SEEN_CHECK_POSTS = 100
+SEEN_SKIP_FRACTION = 0.8
+
+# Inserts shared by the bulk writers, parsed once per connection and then
+# reused from sqlite3's statement cache
+INSERT_POST_SQL = '''
+    INSERT OR IGNORE INTO posts 
+    (id, title, selftext, author, created_utc, score, num_comments, 
+     url, permalink, subreddit, upvote_ratio, is_self, 
+     link_flair_text, post_hint)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+# Secondary indexes, dropped during a comprehensive scrape and rebuilt once
+# at the end instead of being maintained on every insert. The comments index
+# is the one the analyzer and pipeline exports also create, and serves both
+# post_id lookups and their per-post created_utc ordering
+AUX_INDEXES = {
+    'idx_posts_created_utc': 'posts(created_utc)',
+    'idx_posts_subreddit': 'posts(subreddit)',
+    'idx_comments_post_created': 'comments(post_id, created_utc)',
+}
+
+INSERT_COMMENT_SQL = '''
+    INSERT OR IGNORE INTO comments 
+    (id, post_id, parent_id, body, author, created_utc, score, 
+     permalink, depth, is_submitter, is_top_level, parent_comment_id)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+@dataclass(slots=True)
 class RedditPost:
     """Data structure for Reddit posts"""
     id: str
@@ -65,12 +116,8 @@ class RedditPost:
     
     def to_dict(self) -> dict:
         return asdict(self)
-    
-    def get_hash(self) -> str:
-        """Generate unique hash for deduplication"""
-        return hashlib.md5(f"{self.id}_{self.created_utc}".encode()).hexdigest()
 
-@dataclass
+@dataclass(slots=True)
 class RedditComment:
     """Data structure for Reddit comments"""
     id: str
@@ -87,36 +134,48 @@ class RedditComment:
     def to_dict(self) -> dict:
         return asdict(self)
 
+# Insert parameters for a RedditPost, in INSERT_POST_SQL column order
+_post_insert_params = attrgetter(
+    'id', 'title', 'selftext', 'author', 'created_utc', 'score', 'num_comments',
+    'url', 'permalink', 'subreddit', 'upvote_ratio', 'is_self',
+    'link_flair_text', 'post_hint'
+)
+
 class RateLimiter:
     """Smart rate limiting with exponential backoff"""
     
     def __init__(self, max_requests_per_minute: int = 60):
         self.max_requests_per_minute = max_requests_per_minute
-        self.requests = []
+        self.requests = deque(maxlen=max_requests_per_minute)
         self.backoff_time = 1
         self.max_backoff = 300  # 5 minutes max
+        # Fetch worker threads share one limiter; waiters queue behind a sleeping caller
+        self._lock = threading.Lock()
     
     def wait_if_needed(self):
         """Wait if we're approaching rate limits"""
-        now = time.time()
-        # Remove requests older than 1 minute
-        self.requests = [req_time for req_time in self.requests if now - req_time < 60]
-        
-        if len(self.requests) >= self.max_requests_per_minute:
-            sleep_time = 60 - (now - self.requests[0]) + 1
-            logger.info(f"Rate limit reached, sleeping for {sleep_time:.1f} seconds")
-            time.sleep(sleep_time)
-        
-        self.requests.append(now)
+        with self._lock:
+            now = time.time()
+            # Remove requests older than 1 minute (timestamps are in order, so only from the head)
+            while self.requests and now - self.requests[0] >= 60:
+                self.requests.popleft()
+            
+            if len(self.requests) >= self.max_requests_per_minute:
+                sleep_time = 60 - (now - self.requests[0]) + 1
+                logger.info("Rate limit reached, sleeping for %.1f seconds", sleep_time)
+                time.sleep(sleep_time)
+                now = time.time()
+            
+            self.requests.append(now)
     
     def exponential_backoff(self, exception: Exception):
         """Handle API errors with exponential backoff"""
         if isinstance(exception, prawcore.exceptions.TooManyRequests):
-            logger.warning(f"Rate limited, backing off for {self.backoff_time} seconds")
+            logger.warning("Rate limited, backing off for %s seconds", self.backoff_time)
             time.sleep(self.backoff_time)
             self.backoff_time = min(self.backoff_time * 2, self.max_backoff)
         elif isinstance(exception, prawcore.exceptions.ServerError):
-            logger.warning(f"Server error, retrying in {self.backoff_time} seconds")
+            logger.warning("Server error, retrying in %s seconds", self.backoff_time)
             time.sleep(self.backoff_time)
             self.backoff_time = min(self.backoff_time * 1.5, self.max_backoff)
         else:
@@ -124,179 +183,269 @@ class RateLimiter:
             self.backoff_time = 1
             raise exception
 
+class BloomFilter:
+    """Compact set of post IDs: no false negatives, false positives at about error_rate"""
+    
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.001):
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+    
+    def _positions(self, key: str):
+        """Bit positions for a key, by double hashing one 128-bit digest"""
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.num_bits for i in range(self.num_hashes))
+    
+    def add(self, key: str):
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+    
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
 class RedditDatabase:
     """Database manager for storing scraped data"""
     
     def __init__(self, db_path: str = "reddit_data.db"):
         self.db_path = db_path
-        self.init_database()
-    
-    def init_database(self):
-        """Initialize SQLite database with proper schema"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
         
-        # Posts table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS posts (
-                id TEXT PRIMARY KEY,
-                title TEXT,
-                selftext TEXT,
-                author TEXT,
-                created_utc REAL,
-                score INTEGER,
-                num_comments INTEGER,
-                url TEXT,
-                permalink TEXT,
-                subreddit TEXT,
-                upvote_ratio REAL,
-                is_self BOOLEAN,
-                link_flair_text TEXT,
-                post_hint TEXT,
-                hash TEXT UNIQUE,
-                scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Comments table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS comments (
-                id TEXT PRIMARY KEY,
-                post_id TEXT,
-                parent_id TEXT,
-                body TEXT,
-                author TEXT,
-                created_utc REAL,
-                score INTEGER,
-                permalink TEXT,
-                depth INTEGER,
-                is_submitter BOOLEAN,
-                scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (post_id) REFERENCES posts (id)
-            )
+        # One connection for the lifetime of the scraper; transactions are explicit
+        self.conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False,
+                                    cached_statements=256)
+        self.conn.executescript('''
+            PRAGMA journal_mode=WAL;
+            PRAGMA synchronous=NORMAL;
+            PRAGMA temp_store=MEMORY;
+            PRAGMA mmap_size=268435456;
+            PRAGMA cache_size=-65536;
         ''')
         
-        # Progress tracking table
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS scraping_progress (
-                strategy TEXT,
-                sort_method TEXT,
-                time_filter TEXT,
-                last_post_id TEXT,
-                last_created_utc REAL,
-                completed BOOLEAN DEFAULT FALSE,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-        
-        # Create indexes for better query performance
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_posts_created_utc ON posts(created_utc)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_posts_subreddit ON posts(subreddit)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_comments_post_id ON comments(post_id)')
-        cursor.execute('CREATE INDEX IF NOT EXISTS idx_posts_hash ON posts(hash)')
-        
-        conn.commit()
-        conn.close()
+        self.init_database()
     
-    def save_post(self, post: RedditPost) -> bool:
-        """Save post to database, return True if new post"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        try:
+    def init_database(self):
+        """Initialize SQLite database with proper schema"""
+        with self.conn:
+            self.conn.execute('BEGIN')
+            cursor = self.conn.cursor()
+            
+            # Posts table
             cursor.execute('''
-                INSERT OR IGNORE INTO posts 
-                (id, title, selftext, author, created_utc, score, num_comments, 
-                 url, permalink, subreddit, upvote_ratio, is_self, 
-                 link_flair_text, post_hint, hash)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                post.id, post.title, post.selftext, post.author, post.created_utc,
-                post.score, post.num_comments, post.url, post.permalink,
-                post.subreddit, post.upvote_ratio, post.is_self,
-                post.link_flair_text, post.post_hint, post.get_hash()
-            ))
-            
-            is_new = cursor.rowcount > 0
-            conn.commit()
-            return is_new
-        except sqlite3.IntegrityError:
-            return False  # Duplicate
-        finally:
-            conn.close()
+                CREATE TABLE IF NOT EXISTS posts (
+                    id TEXT PRIMARY KEY,
+                    title TEXT,
+                    selftext TEXT,
+                    author TEXT,
+                    created_utc REAL,
+                    score INTEGER,
+                    num_comments INTEGER,
+                    url TEXT,
+                    permalink TEXT,
+                    subreddit TEXT,
+                    upvote_ratio REAL,
+                    is_self BOOLEAN,
+                    link_flair_text TEXT,
+                    post_hint TEXT,
+                    scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    comments_scraped INTEGER DEFAULT 0
+                )
+            ''')
+            
+            # Comments table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS comments (
+                    id TEXT PRIMARY KEY,
+                    post_id TEXT,
+                    parent_id TEXT,
+                    body TEXT,
+                    author TEXT,
+                    created_utc REAL,
+                    score INTEGER,
+                    permalink TEXT,
+                    depth INTEGER,
+                    is_submitter BOOLEAN,
+                    scraped_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    is_top_level BOOLEAN,
+                    parent_comment_id TEXT,
+                    FOREIGN KEY (post_id) REFERENCES posts (id)
+                )
+            ''')
+            
+            # Databases created before is_top_level/parent_comment_id existed
+            cursor.execute('PRAGMA table_info(comments)')
+            comment_columns = {row[1] for row in cursor.fetchall()}
+            if 'is_top_level' not in comment_columns:
+                cursor.execute('ALTER TABLE comments ADD COLUMN is_top_level BOOLEAN')
+                cursor.execute('ALTER TABLE comments ADD COLUMN parent_comment_id TEXT')
+                cursor.execute('''
+                    UPDATE comments SET
+                        is_top_level = substr(parent_id, 1, 3) = 't3_',
+                        parent_comment_id = CASE WHEN substr(parent_id, 1, 3) = 't1_'
+                                                 THEN substr(parent_id, 4) END
+                ''')
+            
+            # Databases created before comments_scraped existed: posts that
+            # already have comments count as done
+            cursor.execute('PRAGMA table_info(posts)')
+            post_columns = {row[1] for row in cursor.fetchall()}
+            if 'comments_scraped' not in post_columns:
+                cursor.execute('ALTER TABLE posts ADD COLUMN comments_scraped INTEGER DEFAULT 0')
+                cursor.execute('''
+                    UPDATE posts SET comments_scraped = 1
+                    WHERE id IN (SELECT DISTINCT post_id FROM comments)
+                ''')
+            
+            # Progress tracking table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS scraping_progress (
+                    strategy TEXT,
+                    sort_method TEXT,
+                    time_filter TEXT,
+                    last_post_id TEXT,
+                    last_created_utc REAL,
+                    completed BOOLEAN DEFAULT FALSE,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            
+            # Create indexes for better query performance (this also restores
+            # them if a scrape stopped before rebuilding them)
+            for name, target in AUX_INDEXES.items():
+                cursor.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {target}')
+            # The id primary key already deduplicates; older databases still
+            # carry a hash column, left NULL, whose extra index is dropped
+            cursor.execute('DROP INDEX IF EXISTS idx_posts_hash')
+            # Superseded by idx_comments_post_created, which starts with post_id
+            cursor.execute('DROP INDEX IF EXISTS idx_comments_post_id')
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_posts_comments_scraped ON posts(comments_scraped)
+                WHERE num_comments > 0 AND comments_scraped = 0
+            ''')
     
-    def save_comment(self, comment: RedditComment):
-        """Save comment to database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT OR IGNORE INTO comments 
-            (id, post_id, parent_id, body, author, created_utc, score, 
-             permalink, depth, is_submitter)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            comment.id, comment.post_id, comment.parent_id, comment.body,
-            comment.author, comment.created_utc, comment.score,
-            comment.permalink, comment.depth, comment.is_submitter
-        ))
-        
-        conn.commit()
-        conn.close()
+    def save_posts_bulk(self, posts: List[RedditPost]) -> int:
+        """Save posts in a single transaction, return the number of new posts"""
+        if not posts:
+            return 0
+        
+        with self.conn:
+            self.conn.execute('BEGIN IMMEDIATE')
+            cursor = self.conn.executemany(INSERT_POST_SQL, map(_post_insert_params, posts))
+        return cursor.rowcount
     
-    def get_scraped_post_ids(self) -> Set[str]:
-        """Get all scraped post IDs for deduplication"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT id FROM posts')
-        post_ids = {row[0] for row in cursor.fetchall()}
-        
-        conn.close()
-        return post_ids
+    def save_comments_bulk(self, comments: List[RedditComment]) -> int:
+        """Save comments in a single transaction, return the number of new comments"""
+        if not comments:
+            return 0
+        
+        with self.conn:
+            self.conn.execute('BEGIN IMMEDIATE')
+            # Split the parent fullname once here so readers never parse it
+            cursor = self.conn.executemany(INSERT_COMMENT_SQL, [
+                (comment.id, comment.post_id, comment.parent_id, comment.body,
+                 comment.author, comment.created_utc, comment.score,
+                 comment.permalink, comment.depth, comment.is_submitter,
+                 comment.parent_id.startswith('t3_'),
+                 comment.parent_id[3:] if comment.parent_id.startswith('t1_') else None)
+                for comment in comments
+            ])
+        return cursor.rowcount
+    
+    def iter_post_ids(self) -> Iterator[str]:
+        """Yield every scraped post ID for deduplication, one row at a time"""
+        cursor = self.conn.execute('SELECT id FROM posts')
+        for (post_id,) in cursor:
+            yield post_id
+    
+    def count_posts(self) -> int:
+        """Number of scraped posts"""
+        return self.conn.execute('SELECT COUNT(*) FROM posts').fetchone()[0]
+    
+    def has_post(self, post_id: str) -> bool:
+        """Check whether a post has been scraped, by primary key lookup"""
+        return self.conn.execute('SELECT 1 FROM posts WHERE id = ?', (post_id,)).fetchone() is not None
     
     def get_posts_without_comments(self) -> List[str]:
         """Get post IDs that don't have comments scraped yet"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT p.id FROM posts p
-            LEFT JOIN comments c ON p.id = c.post_id
-            WHERE c.post_id IS NULL AND p.num_comments > 0
-        ''')
+        # Found through the partial index idx_posts_comments_scraped. The IDs are
+        # read out in full before any comments are saved, because saving updates
+        # comments_scraped, which would change the index under an open cursor
+        cursor = self.conn.execute('SELECT id FROM posts WHERE comments_scraped = 0 AND num_comments > 0')
         
-        post_ids = [row[0] for row in cursor.fetchall()]
-        conn.close()
-        return post_ids
+        return [post_id for (post_id,) in cursor]
+    
+    def mark_comments_scraped(self, post_id: str):
+        """Record that a post's comments have been scraped"""
+        self.conn.execute('UPDATE posts SET comments_scraped = 1 WHERE id = ?', (post_id,))
     
     def update_progress(self, strategy: str, sort_method: str, time_filter: str, 
                        last_post_id: str, last_created_utc: float, completed: bool = False):
         """Update scraping progress"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT OR REPLACE INTO scraping_progress
-            (strategy, sort_method, time_filter, last_post_id, last_created_utc, completed)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (strategy, sort_method, time_filter, last_post_id, last_created_utc, completed))
-        
-        conn.commit()
-        conn.close()
+        with self.conn:
+            self.conn.execute('BEGIN')
+            self.conn.execute('''
+                INSERT OR REPLACE INTO scraping_progress
+                (strategy, sort_method, time_filter, last_post_id, last_created_utc, completed)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (strategy, sort_method, time_filter, last_post_id, last_created_utc, completed))
+    
+    def drop_aux_indexes(self):
+        """Drop the secondary indexes ahead of a bulk load"""
+        with self.conn:
+            self.conn.execute('BEGIN')
+            for name in AUX_INDEXES:
+                self.conn.execute(f'DROP INDEX IF EXISTS {name}')
+    
+    def create_aux_indexes(self):
+        """Rebuild the secondary indexes after a bulk load"""
+        with self.conn:
+            self.conn.execute('BEGIN')
+            for name, target in AUX_INDEXES.items():
+                self.conn.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {target}')
+    
+    @contextmanager
+    def read_snapshot(self):
+        """Run the enclosed queries in one read transaction, against a single snapshot"""
+        with self.conn:
+            self.conn.execute('BEGIN')
+            yield
+    
+    @contextmanager
+    def bulk_load(self):
+        """Suspend WAL auto-checkpoints for a burst of writes, then checkpoint once at the end"""
+        self.conn.execute('PRAGMA wal_autocheckpoint=0')
+        try:
+            yield
+        finally:
+            self.conn.execute('PRAGMA wal_autocheckpoint=1000')
+            self.conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    
+    def close(self):
+        """Close database connection"""
+        self.conn.close()
 
-class RedditScraper:
+class RedditScraper(KeywordFilterMixin):
     """Comprehensive Reddit scraper using multiple strategies"""
     
     def __init__(self, client_id: str, client_secret: str, user_agent: str):
-        self.reddit = praw.Reddit(
-            client_id=client_id,
-            client_secret=client_secret,
-            user_agent=user_agent
-        )
+        self.credentials = {
+            'client_id': client_id,
+            'client_secret': client_secret,
+            'user_agent': user_agent
+        }
+        self.reddit = praw.Reddit(**self.credentials)
+        self._thread_reddits = ThreadLocalReddit([self.credentials])
         self.database = RedditDatabase()
         self.rate_limiter = RateLimiter()
-        self.scraped_posts = self.database.get_scraped_post_ids()
+        
+        # A Bloom filter instead of a set of every scraped ID: a miss means the
+        # post is new, a hit is confirmed against the database
+        self.seen_bloom = BloomFilter(capacity=max(1_000_000, 2 * self.database.count_posts()))
+        for post_id in self.database.iter_post_ids():
+            self.seen_bloom.add(post_id)
+        
+        # Posts built but waiting in a batch, not yet in the database or the filter
+        self._queued_post_ids = set()
         
         # Scraping strategies configuration
         self.sort_methods = ['hot', 'new', 'top']
@@ -310,83 +459,40 @@ class RedditScraper:
         
         logger.info("Reddit scraper initialized")
     
-    def set_keyword_filter(self, keywords: List[str], mode: str = 'include_only', 
-                          case_sensitive: bool = False, search_in_content: bool = True):
-        """
-        Set keyword filtering options
-        
-        Args:
-            keywords: List of keywords to filter by
-            mode: 'include_only' (only posts with keywords), 'exclude' (posts without keywords), 'disabled' (no filtering)
-            case_sensitive: Whether keyword matching should be case sensitive
-            search_in_content: Whether to search in post content (selftext) in addition to title
-        """
-        self.keywords = [k.lower() if not case_sensitive else k for k in keywords]
-        self.keyword_mode = mode
-        self.case_sensitive = case_sensitive
-        self.search_in_content = search_in_content
-        
-        logger.info(f"Keyword filter set: mode={mode}, keywords={keywords}, case_sensitive={case_sensitive}")
-    
-    def _matches_keywords(self, post) -> bool:
-        """Check if a post matches the current keyword filter"""
-        if self.keyword_mode == 'disabled' or not self.keywords:
-            return True
-        
-        # Prepare text to search in
-        title = post.title if self.case_sensitive else post.title.lower()
-        content = ''
-        
-        if self.search_in_content and hasattr(post, 'selftext'):
-            content = post.selftext if self.case_sensitive else post.selftext.lower()
-        
-        search_text = f"{title} {content}".strip()
-        
-        # Check for keyword matches
-        matches_any_keyword = False
-        for keyword in self.keywords:
-            if keyword in search_text:
-                matches_any_keyword = True
-                break
-        
-        # Apply filtering logic based on mode
-        if self.keyword_mode == 'include_only':
-            return matches_any_keyword
-        elif self.keyword_mode == 'exclude':
-            return not matches_any_keyword
-        
-        return True
-
     def scrape_subreddit_comprehensive(self, subreddit_name: str):
         """Main method to scrape subreddit using all strategies"""
-        logger.info(f"Starting comprehensive scrape of r/{subreddit_name}")
+        logger.info("Starting comprehensive scrape of r/%s", subreddit_name)
         if self.keyword_mode != 'disabled':
-            logger.info(f"Keyword filtering active: {self.keyword_mode} - {self.keywords}")
+            logger.info("Keyword filtering active: %s - %s", self.keyword_mode, self.keywords)
         
         subreddit = self.reddit.subreddit(subreddit_name)
         
-        # Strategy 1: Sort-based collection with time filters
-        self._scrape_by_sort_methods(subreddit)
-        
-        # Strategy 2: Time-based segmentation
-        self._scrape_by_time_periods(subreddit)
-        
-        # Strategy 3: Search-based collection
-        self._scrape_by_search_terms(subreddit)
-        
-        # Strategy 4: User-based collection
-        self._scrape_by_active_users(subreddit)
+        # Building the secondary indexes once afterwards is cheaper than
+        # updating them on every insert; nothing below reads them
+        self.database.drop_aux_indexes()
         
-        # Final step: Scrape comments for all posts
-        self._scrape_missing_comments()
+        try:
+            # Strategy 1: Sort-based collection with time filters
+            self._scrape_by_sort_methods(subreddit)
+            
+            # Strategy 2: Search-based collection
+            self._scrape_by_search_terms(subreddit)
+            
+            # Strategy 3: User-based collection
+            self._scrape_by_active_users(subreddit)
+            
+            # Final step: Scrape comments for all posts
+            self._scrape_missing_comments()
+        finally:
+            self.database.create_aux_indexes()
         
-        logger.info(f"Comprehensive scrape completed for r/{subreddit_name}")
+        logger.info("Comprehensive scrape completed for r/%s", subreddit_name)
         
         # Auto-export subreddit data to JSON
         try:
             self.export_subreddit_json(subreddit_name)
         except Exception as e:
-            logger.error(f"Error exporting JSON for r/{subreddit_name}: {e}")
+            logger.error("Error exporting JSON for r/%s: %s", subreddit_name, e)
     
     def scrape_subreddit_keywords_only(self, subreddit_name: str, keywords: List[str], 
                                      case_sensitive: bool = False, include_comments: bool = True):
@@ -400,7 +506,7 @@ class RedditScraper:
             case_sensitive: Whether search should be case sensitive
             include_comments: Whether to scrape comments for matching posts
         """
-        logger.info(f"Starting keyword-only scrape of r/{subreddit_name} for keywords: {keywords}")
+        logger.info("Starting keyword-only scrape of r/%s for keywords: %s", subreddit_name, keywords)
         
         subreddit = self.reddit.subreddit(subreddit_name)
         total_new_posts = 0
@@ -408,7 +514,7 @@ class RedditScraper:
         # Search for each keyword directly
         for keyword in keywords:
             try:
-                logger.info(f"Searching for keyword: '{keyword}'")
+                logger.info("Searching for keyword: '%s'", keyword)
                 
                 search_results = subreddit.search(
                     keyword, 
@@ -417,39 +523,45 @@ class RedditScraper:
                     limit=1000
                 )
                 
-                new_posts_count = 0
+                new_posts = []
                 for post in search_results:
                     # Additional filtering if case sensitive
                     if case_sensitive:
                         title_text = post.title
-                        content_text = getattr(post, 'selftext', '')
+                        content_text = vars(post).get('selftext') or ''
                         search_text = f"{title_text} {content_text}"
                         
                         if keyword not in search_text:
                             continue
                     
-                    if self._process_post(post):
-                        new_posts_count += 1
-                        total_new_posts += 1
-                        
-                        # Scrape comments immediately if requested
-                        if include_comments and post.num_comments > 0:
-                            self._scrape_post_comments(post.id)
+                    reddit_post = self._process_post(post)
+                    if reddit_post is not None:
+                        new_posts.append(reddit_post)
+                
+                # Search results are capped at 1000, so one transaction per keyword
+                new_posts_count = self._save_posts(new_posts)
+                total_new_posts += new_posts_count
                 
-                logger.info(f"Keyword '{keyword}': {new_posts_count} new posts found")
+                # Scrape comments for the new posts if requested
+                if include_comments:
+                    self._scrape_comments([
+                        reddit_post.id for reddit_post in new_posts if reddit_post.num_comments > 0
+                    ])
+                
+                logger.info("Keyword '%s': %d new posts found", keyword, new_posts_count)
                 self.rate_limiter.wait_if_needed()
                 
             except Exception as e:
-                logger.error(f"Error searching for keyword '{keyword}': {e}")
+                logger.error("Error searching for keyword '%s': %s", keyword, e)
                 self.rate_limiter.exponential_backoff(e)
         
-        logger.info(f"Keyword-only scrape completed: {total_new_posts} total new posts")
+        logger.info("Keyword-only scrape completed: %d total new posts", total_new_posts)
         
         # Auto-export subreddit data to JSON
         try:
             self.export_subreddit_json(subreddit_name)
         except Exception as e:
-            logger.error(f"Error exporting JSON for r/{subreddit_name}: {e}")
+            logger.error("Error exporting JSON for r/%s: %s", subreddit_name, e)
         
         return total_new_posts
     
@@ -462,12 +574,12 @@ class RedditScraper:
                 try:
                     self._scrape_with_sort(subreddit, sort_method, time_filter)
                 except Exception as e:
-                    logger.error(f"Error in sort method {sort_method}/{time_filter}: {e}")
+                    logger.error("Error in sort method %s/%s: %s", sort_method, time_filter, e)
                     self.rate_limiter.exponential_backoff(e)
     
     def _scrape_with_sort(self, subreddit, sort_method: str, time_filter: Optional[str]):
         """Scrape posts using specific sort method"""
-        logger.info(f"Scraping with sort: {sort_method}, time_filter: {time_filter}")
+        logger.info("Scraping with sort: %s, time_filter: %s", sort_method, time_filter)
         
         self.rate_limiter.wait_if_needed()
         
@@ -481,136 +593,129 @@ class RedditScraper:
             
             new_posts_count = 0
             total_processed = 0
-            
-            for post in posts:
-                if self._process_post(post):
-                    new_posts_count += 1
-                
-                total_processed += 1
-                
-                # Log progress every 100 posts
-                if total_processed % 100 == 0:
-                    logger.info(f"Processed {total_processed} posts, {new_posts_count} new")
-                
-                # Respect rate limits
-                if total_processed % 50 == 0:
-                    self.rate_limiter.wait_if_needed()
-            
-            logger.info(f"Completed {sort_method}/{time_filter}: {new_posts_count} new posts out of {total_processed}")
-            
-        except Exception as e:
-            logger.error(f"Error scraping {sort_method}/{time_filter}: {e}")
-            self.rate_limiter.exponential_backoff(e)
-    
-    def _scrape_by_time_periods(self, subreddit):
-        """Strategy 2: Time-based segmentation to get historical posts"""
-        logger.info("Starting time-based segmentation strategy")
-        
-        # Get subreddit creation date or start from a reasonable point
-        end_date = datetime.now()
-        start_date = datetime(2020, 1, 1)  # Adjust based on subreddit age
-        
-        # Split into monthly segments
-        current_date = start_date
-        
-        while current_date < end_date:
-            next_date = current_date + timedelta(days=30)
-            if next_date > end_date:
-                next_date = end_date
+            known_count = 0
+            check_seen = sort_method == 'top' and time_filter not in (None, 'all')
+            batch = []
             
             try:
-                self._scrape_time_range(subreddit, current_date, next_date)
-            except Exception as e:
-                logger.error(f"Error scraping time range {current_date} to {next_date}: {e}")
-                self.rate_limiter.exponential_backoff(e)
-            
-            current_date = next_date
-    
-    def _scrape_time_range(self, subreddit, start_date: datetime, end_date: datetime):
-        """Scrape posts within a specific time range using search"""
-        start_timestamp = int(start_date.timestamp())
-        end_timestamp = int(end_date.timestamp())
-        
-        logger.info(f"Scraping time range: {start_date.strftime('%Y-%m-%d')} to {end_date.strftime('%Y-%m-%d')}")
-        
-        # Use Reddit search with timestamp filters
-        query = f"subreddit:{subreddit.display_name} timestamp:{start_timestamp}..{end_timestamp}"
-        
-        try:
-            search_results = self.reddit.subreddit('all').search(
-                query, 
-                sort='new', 
-                time_filter='all', 
-                limit=None
-            )
-            
-            new_posts_count = 0
-            for post in search_results:
-                if post.subreddit.display_name.lower() == subreddit.display_name.lower():
-                    if self._process_post(post):
-                        new_posts_count += 1
+                for post in posts:
+                    known = self._is_known_post(post.id)
+                    if check_seen and known:
+                        known_count += 1
+                    
+                    reddit_post = self._process_post(post, known=known)
+                    if reddit_post is not None:
+                        batch.append(reddit_post)
+                        if len(batch) >= POST_BATCH_SIZE:
+                            new_posts_count += self._save_posts(batch)
+                            batch = []
+                    
+                    total_processed += 1
+                    
+                    if check_seen and total_processed == SEEN_CHECK_POSTS:
+                        if known_count >= SEEN_SKIP_FRACTION * SEEN_CHECK_POSTS:
+                            logger.info("Stopping %s/%s: %d of the first %d posts already collected",
+                                        sort_method, time_filter, known_count, total_processed)
+                            break
+                        check_seen = False
+                    
+                    # Log progress every 100 posts
+                    if total_processed % 100 == 0:
+                        logger.info("Processed %d posts, %d new", total_processed, new_posts_count + len(batch))
+                    
+                    # Respect rate limits
+                    if total_processed % 50 == 0:
+                        self.rate_limiter.wait_if_needed()
+            finally:
+                # Keep what was collected even if the listing fails part way
+                new_posts_count += self._save_posts(batch)
             
-            logger.info(f"Time range {start_date.strftime('%Y-%m-%d')}: {new_posts_count} new posts")
+            logger.info("Completed %s/%s: %d new posts out of %d", sort_method, time_filter, new_posts_count, total_processed)
             
         except Exception as e:
-            logger.error(f"Error in time range search: {e}")
+            logger.error("Error scraping %s/%s: %s", sort_method, time_filter, e)
             self.rate_limiter.exponential_backoff(e)
     
     def _scrape_by_search_terms(self, subreddit):
-        """Strategy 3: Search-based collection using common terms"""
+        """Strategy 2: Search-based collection using common terms"""
         logger.info("Starting search-based collection strategy")
         
         # Get common terms from already scraped post titles
         search_terms = self._extract_search_terms()
         
-        for term in search_terms:
+        # Searches run in worker threads, which wait on the rate limiter before
+        # each page request. This thread saves results in term order as they
+        # finish, with at most two searches per worker pending.
+        pending = deque()
+        
+        def save_next():
+            term, search = pending.popleft()
             try:
-                self._scrape_by_search_term(subreddit, term)
-                self.rate_limiter.wait_if_needed()
+                self._scrape_by_search_term(term, search)
             except Exception as e:
-                logger.error(f"Error searching for term '{term}': {e}")
+                logger.error("Error searching for term '%s': %s", term, e)
                 self.rate_limiter.exponential_backoff(e)
+        
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+            for term in search_terms:
+                pending.append((term, executor.submit(self._fetch_search_results, subreddit.display_name, term)))
+                if len(pending) >= 2 * FETCH_WORKERS:
+                    save_next()
+            
+            while pending:
+                save_next()
     
     def _extract_search_terms(self) -> List[str]:
         """Extract common terms from existing post titles for search"""
         # Only use user-defined keywords if keyword filtering is active
+        # Case folding can make keywords repeat; search each one once, in order
         if self.keyword_mode != 'disabled' and self.keywords:
-            return self.keywords
+            return list(dict.fromkeys(self.keywords))
         
         # Fallback to generic terms only if no keywords are set
-        common_terms = [
+        common_terms = (
             "question", "help", "issue", "problem", "tutorial", "guide",
             "announcement", "update", "discussion", "review", "comparison",
             "tips", "tricks", "best", "worst", "opinion", "thoughts"
-        ]
+        )
         
-        return common_terms
+        return list(dict.fromkeys(common_terms))
     
-    def _scrape_by_search_term(self, subreddit, search_term: str):
-        """Scrape posts matching a specific search term"""
-        logger.info(f"Searching for posts with term: '{search_term}'")
+    def _fetch_listing(self, listing) -> list:
+        """Read a whole listing, waiting on the rate limiter before each page request"""
+        posts = []
+        self.rate_limiter.wait_if_needed()
+        for post in listing:
+            posts.append(post)
+            # A full page means the next item needs another request
+            if len(posts) % LISTING_PAGE_SIZE == 0:
+                self.rate_limiter.wait_if_needed()
+        return posts
+    
+    def _fetch_search_results(self, subreddit_name: str, search_term: str) -> list:
+        """Worker thread entry point: fetch every post matching a search term"""
+        return self._fetch_listing(self._thread_reddits.get().subreddit(subreddit_name).search(
+            search_term, 
+            sort='new', 
+            time_filter='all', 
+            limit=1000
+        ))
+    
+    def _scrape_by_search_term(self, search_term: str, search):
+        """Save the posts from a search term's pending fetch"""
+        logger.debug("Searching for posts with term: '%s'", search_term)
         
         try:
-            search_results = subreddit.search(
-                search_term, 
-                sort='new', 
-                time_filter='all', 
-                limit=1000
-            )
+            new_posts_count = self._save_new_posts(search.result())
             
-            new_posts_count = 0
-            for post in search_results:
-                if self._process_post(post):
-                    new_posts_count += 1
-            
-            logger.info(f"Search term '{search_term}': {new_posts_count} new posts")
+            logger.debug("Search term '%s': %d new posts", search_term, new_posts_count)
             
         except Exception as e:
-            logger.error(f"Error searching for '{search_term}': {e}")
+            logger.error("Error searching for '%s': %s", search_term, e)
             self.rate_limiter.exponential_backoff(e)
     
     def _scrape_by_active_users(self, subreddit):
-        """Strategy 4: Find active users and scrape their posts"""
+        """Strategy 3: Find active users and scrape their posts"""
         logger.info("Starting user-based collection strategy")
         
         # Get active users from recent posts
@@ -619,261 +724,372 @@ class RedditScraper:
         try:
             recent_posts = list(subreddit.new(limit=200))
             for post in recent_posts:
-                if hasattr(post, 'author') and post.author:
-                    active_users.add(post.author.name)
+                username = author_name(post)
+                if username != '[deleted]':
+                    active_users.add(username)
         except Exception as e:
-            logger.error(f"Error getting active users: {e}")
+            logger.error("Error getting active users: %s", e)
             return
         
-        # Scrape posts from each active user
-        for username in list(active_users)[:50]:  # Limit to top 50 users
+        # Scrape posts from each active user, fetching histories in worker threads
+        # and saving each one as it finishes, with at most two per worker pending
+        pending = deque()
+        
+        def save_next():
+            username, history = pending.popleft()
             try:
-                self._scrape_user_posts(username, subreddit.display_name)
-                self.rate_limiter.wait_if_needed()
+                self._scrape_user_posts(username, subreddit.display_name, history)
             except Exception as e:
-                logger.error(f"Error scraping user {username}: {e}")
+                logger.error("Error scraping user %s: %s", username, e)
                 self.rate_limiter.exponential_backoff(e)
+        
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+            for username in list(active_users)[:50]:  # Limit to top 50 users
+                pending.append((username, executor.submit(self._fetch_user_posts, username)))
+                if len(pending) >= 2 * FETCH_WORKERS:
+                    save_next()
+            
+            while pending:
+                save_next()
+    
+    def _fetch_user_posts(self, username: str) -> list:
+        """Worker thread entry point: fetch a user's recent posts"""
+        return self._fetch_listing(self._thread_reddits.get().redditor(username).submissions.new(limit=100))
     
-    def _scrape_user_posts(self, username: str, subreddit_name: str):
-        """Scrape posts from a specific user in the subreddit"""
+    def _scrape_user_posts(self, username: str, subreddit_name: str, history):
+        """Save a user's posts in the subreddit from their pending history fetch"""
+        target = subreddit_name.lower()
+        
         try:
-            user = self.reddit.redditor(username)
-            submissions = user.submissions.new(limit=100)
+            submissions = history.result()
             
-            new_posts_count = 0
-            for post in submissions:
-                if post.subreddit.display_name.lower() == subreddit_name.lower():
-                    if self._process_post(post):
-                        new_posts_count += 1
+            new_posts_count = self._save_new_posts(
+                post for post in submissions
+                if post.subreddit.display_name.lower() == target
+            )
             
             if new_posts_count > 0:
-                logger.info(f"User {username}: {new_posts_count} new posts")
+                logger.debug("User %s: %d new posts", username, new_posts_count)
                 
         except Exception as e:
-            logger.error(f"Error scraping user {username}: {e}")
+            logger.error("Error scraping user %s: %s", username, e)
     
-    def _process_post(self, post) -> bool:
-        """Process a single post and return True if it's new"""
+    def _save_new_posts(self, posts) -> int:
+        """Process posts from a listing and save them in batches, return how many were new"""
+        new_posts_count = 0
+        batch = []
+        
         try:
-            # Skip if already processed
-            if post.id in self.scraped_posts:
-                return False
+            for post in posts:
+                reddit_post = self._process_post(post)
+                if reddit_post is not None:
+                    batch.append(reddit_post)
+                    if len(batch) >= POST_BATCH_SIZE:
+                        new_posts_count += self._save_posts(batch)
+                        batch = []
+        finally:
+            # Keep what was collected even if the listing fails part way
+            new_posts_count += self._save_posts(batch)
+        
+        return new_posts_count
+    
+    def _save_posts(self, posts: List[RedditPost]) -> int:
+        """Save a batch of processed posts, return how many were new"""
+        try:
+            new_posts_count = self.database.save_posts_bulk(posts)
+        finally:
+            self._queued_post_ids.difference_update(post.id for post in posts)
+        
+        for post in posts:
+            self.seen_bloom.add(post.id)
+        return new_posts_count
+    
+    def _is_known_post(self, post_id: str) -> bool:
+        """Whether a post is already saved or waiting in a batch"""
+        if post_id in self._queued_post_ids:
+            return True
+        return post_id in self.seen_bloom and self.database.has_post(post_id)
+    
+    def _process_post(self, post, known: Optional[bool] = None) -> Optional[RedditPost]:
+        """Build a RedditPost for an unseen post matching the keyword filter, or None
+        
+        known: the caller's _is_known_post() result for this post, if it already has one
+        """
+        try:
+            # Skip if already processed or already waiting in a batch, before
+            # any other attribute is read
+            post_id = post.id
+            if known is None:
+                known = self._is_known_post(post_id)
+            if known:
+                return None
             
             if not self._matches_keywords(post):
-                return False
+                return None
             
+            # Read optional fields from the listing data: getattr() on a field the
+            # listing omitted (e.g. post_hint on text posts) makes PRAW fetch the post
+            listing_data = vars(post)
             reddit_post = RedditPost(
-                id=post.id,
+                id=post_id,
                 title=post.title,
-                selftext=getattr(post, 'selftext', ''),
-                author=post.author.name if post.author else '[deleted]',
+                selftext=listing_data.get('selftext', ''),
+                author=author_name(post),
                 created_utc=post.created_utc,
                 score=post.score,
                 num_comments=post.num_comments,
                 url=post.url,
                 permalink=post.permalink,
                 subreddit=post.subreddit.display_name,
-                upvote_ratio=getattr(post, 'upvote_ratio', 0.0),
+                upvote_ratio=listing_data.get('upvote_ratio', 0.0),
                 is_self=post.is_self,
-                link_flair_text=getattr(post, 'link_flair_text', None),
-                post_hint=getattr(post, 'post_hint', None)
+                link_flair_text=listing_data.get('link_flair_text'),
+                post_hint=listing_data.get('post_hint')
             )
             
-            is_new = self.database.save_post(reddit_post)
-            if is_new:
-                self.scraped_posts.add(post.id)
-                return True
-            
-            return False
+            self._queued_post_ids.add(post_id)
+            return reddit_post
             
         except Exception as e:
-            logger.error(f"Error processing post {post.id}: {e}")
-            return False
+            logger.error("Error processing post %s: %s", post.id, e)
+            return None
     
     def _scrape_missing_comments(self):
         """Scrape comments for posts that don't have comments yet"""
         logger.info("Starting comment collection for posts without comments")
         
         posts_without_comments = self.database.get_posts_without_comments()
-        logger.info(f"Found {len(posts_without_comments)} posts without comments")
+        logger.info("Found %d posts without comments", len(posts_without_comments))
         
-        for i, post_id in enumerate(posts_without_comments):
-            try:
-                self._scrape_post_comments(post_id)
-                
-                if (i + 1) % 10 == 0:
-                    logger.info(f"Scraped comments for {i + 1}/{len(posts_without_comments)} posts")
-                
+        with self.database.bulk_load():
+            self._scrape_comments(posts_without_comments)
+    
+    def _scrape_comments(self, post_ids: List[str]):
+        """Scrape all comments for several posts"""
+        # Comment trees download in worker threads while this thread, the only
+        # database writer, saves them in post order. At most two fetches per
+        # worker are pending, so finished trees don't pile up in memory.
+        pending = deque()
+        saved = 0
+        
+        def save_next():
+            nonlocal saved
+            self._save_fetched_comments(*pending.popleft())
+            saved += 1
+            if saved % 10 == 0:
+                logger.info("Scraped comments for %d/%d posts", saved, len(post_ids))
+        
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+            for post_id in post_ids:
                 self.rate_limiter.wait_if_needed()
-                
-            except Exception as e:
-                logger.error(f"Error scraping comments for post {post_id}: {e}")
-                self.rate_limiter.exponential_backoff(e)
+                pending.append((post_id, executor.submit(self._fetch_post_comments, post_id)))
+                if len(pending) >= 2 * FETCH_WORKERS:
+                    save_next()
+            
+            while pending:
+                save_next()
+    
+    def _fetch_post_comments(self, post_id: str) -> List[RedditComment]:
+        """Worker thread entry point: fetch and flatten all comments for a post"""
+        return self._collect_post_comments(self._thread_reddits.get().submission(id=post_id), post_id)
     
-    def _scrape_post_comments(self, post_id: str):
-        """Scrape all comments for a specific post"""
+    def _save_fetched_comments(self, post_id: str, fetch):
+        """Save a post's comments from its pending fetch"""
         try:
-            submission = self.reddit.submission(id=post_id)
-            submission.comments.replace_more(limit=None)  # Get all comments
-            
-            comment_count = 0
-            
-            def process_comment(comment, depth=0):
-                nonlocal comment_count
-                
-                if hasattr(comment, 'body') and comment.body != '[deleted]':
-                    reddit_comment = RedditComment(
-                        id=comment.id,
-                        post_id=post_id,
-                        parent_id=comment.parent_id,
-                        body=comment.body,
-                        author=comment.author.name if comment.author else '[deleted]',
-                        created_utc=comment.created_utc,
-                        score=comment.score,
-                        permalink=comment.permalink,
-                        depth=depth,
-                        is_submitter=comment.is_submitter
-                    )
-                    
-                    self.database.save_comment(reddit_comment)
-                    comment_count += 1
-                
-                # Process replies recursively
-                if hasattr(comment, 'replies'):
-                    for reply in comment.replies:
-                        process_comment(reply, depth + 1)
+            self._save_post_comments(post_id, fetch.result())
+        except Exception as e:
+            logger.error("Error scraping comments for post %s: %s", post_id, e)
+    
+    @staticmethod
+    def _collect_post_comments(submission, post_id: str) -> List[RedditComment]:
+        """Load a submission's full comment tree and flatten it into RedditComments"""
+        submission.comments.replace_more(limit=None)  # Get all comments
+        
+        comments = []
+        
+        # Walk the tree depth-first with an explicit stack instead of recursion,
+        # so deep threads cannot hit the recursion limit; children are pushed
+        # reversed to keep the same order as a recursive walk
+        stack = [(comment, 0) for comment in reversed(submission.comments)]
+        while stack:
+            comment, depth = stack.pop()
             
-            # Process all top-level comments
-            for comment in submission.comments:
-                process_comment(comment)
+            if hasattr(comment, 'body') and comment.body != '[deleted]':
+                comments.append(RedditComment(
+                    id=comment.id,
+                    post_id=post_id,
+                    parent_id=comment.parent_id,
+                    body=comment.body,
+                    author=author_name(comment),
+                    created_utc=comment.created_utc,
+                    score=comment.score,
+                    permalink=comment.permalink,
+                    depth=depth,
+                    is_submitter=comment.is_submitter
+                ))
             
-            if comment_count > 0:
-                logger.info(f"Scraped {comment_count} comments for post {post_id}")
-                
-        except Exception as e:
-            logger.error(f"Error scraping comments for post {post_id}: {e}")
+            replies = getattr(comment, 'replies', None)
+            if replies:
+                stack.extend((reply, depth + 1) for reply in reversed(replies))
+        
+        return comments
+    
+    def _save_post_comments(self, post_id: str, comments: List[RedditComment]):
+        """Save a post's comments in one transaction and mark the post as done"""
+        self.database.save_comments_bulk(comments)
+        self.database.mark_comments_scraped(post_id)
+        
+        if comments:
+            logger.debug("Scraped %d comments for post %s", len(comments), post_id)
     
     def export_subreddit_json(self, subreddit_name: str) -> str:
-        """Export posts and comments for a specific subreddit to JSON"""
-        conn = sqlite3.connect(self.database.db_path)
-        cursor = conn.cursor()
+        """
+        Export posts and comments for a specific subreddit to JSON
         
-        # Get posts for the specific subreddit
-        cursor.execute('''
-            SELECT id, title, selftext, author, created_utc, score, num_comments,
-                   url, permalink, subreddit, upvote_ratio, is_self, 
+        Posts are written to disk as they are read, so the full export is never
+        held in memory.
+        """
+        # One read transaction, so the totals match the rows written below
+        with self.database.read_snapshot():
+            cursor = self.database.conn.cursor()
+            
+            # Count totals up front, since the metadata is written before the posts
+            cursor.execute('SELECT COUNT(*) FROM posts WHERE subreddit = ?', (subreddit_name,))
+            total_posts = cursor.fetchone()[0]
+            cursor.execute('''
+                SELECT COUNT(*) FROM comments c
+                JOIN posts p ON p.id = c.post_id
+                WHERE p.subreddit = ?
+            ''', (subreddit_name,))
+            total_comments = cursor.fetchone()[0]
+            
+            logger.info("Exporting %d posts from r/%s to JSON...", total_posts, subreddit_name)
+            
+            # The datetime is left to orjson, which writes it in ISO 8601 like isoformat()
+            metadata = {
+                'export_date': datetime.now(),
+                'total_posts': total_posts,
+                'total_comments': total_comments,
+                'subreddit': subreddit_name,
+                'description': f'r/{subreddit_name} posts and comments - auto-exported after scraping'
+            }
+            
+            # Save to JSON file with subreddit name, laid out as json.dump(indent=2)
+            # would: the metadata object is reopened and each post is indented into
+            # the "posts" array
+            filename = f'{subreddit_name}_data.json'
+            with open(filename, 'wb') as f:
+                header = orjson.dumps({'metadata': metadata}, option=orjson.OPT_INDENT_2)
+                f.write(header[:-2] + b',\n  "posts": [')
+            
+                wrote_posts = False
+                for post_dict in self._iter_export_posts(subreddit_name):
+                    f.write(b',\n    ' if wrote_posts else b'\n    ')
+                    f.write(orjson.dumps(post_dict, option=orjson.OPT_INDENT_2).replace(b'\n', b'\n    '))
+                    wrote_posts = True
+            
+                f.write(b'\n  ]\n}' if wrote_posts else b']\n}')
+        
+        logger.info("✅ Exported r/%s data to %s", subreddit_name, filename)
+        logger.info("📊 Export summary: %s posts, %s comments", format(total_posts, ","), format(total_comments, ","))
+        
+        return filename
+    
+    def _iter_export_posts(self, subreddit_name: str) -> Iterator[Dict]:
+        """Yield export records for a subreddit's posts, newest first, with their comments"""
+        post_cursor = self.database.conn.cursor()
+        comment_cursor = self.database.conn.cursor()
+        
+        # Stream comments in the same order as posts, grouped per post
+        comment_cursor.execute('''
+            SELECT c.id, c.parent_id, c.body, c.author, c.created_utc,
+                   strftime('%Y-%m-%dT%H:%M:%S', c.created_utc, 'unixepoch', 'localtime') as created_datetime,
+                   c.score, c.permalink, c.depth, c.is_submitter, c.post_id
+            FROM comments c
+            JOIN posts p ON p.id = c.post_id
+            WHERE p.subreddit = ?
+            ORDER BY p.created_utc DESC, p.id, c.created_utc, c.rowid
+        ''', (subreddit_name,))
+        comment_groups = groupby(comment_cursor, key=itemgetter(10))
+        next_group = next(comment_groups, None)
+        
+        # created_datetime is derived in SQLite, in local time
+        post_cursor.execute('''
+            SELECT id, title, selftext, author, created_utc,
+                   strftime('%Y-%m-%dT%H:%M:%S', created_utc, 'unixepoch', 'localtime') as created_datetime,
+                   score, num_comments, url, permalink, subreddit, upvote_ratio, is_self, 
                    link_flair_text, post_hint
             FROM posts 
             WHERE subreddit = ?
-            ORDER BY created_utc DESC
+            ORDER BY created_utc DESC, id
         ''', (subreddit_name,))
         
-        posts_data = cursor.fetchall()
-        subreddit_posts = []
-        
-        logger.info(f"Exporting {len(posts_data)} posts from r/{subreddit_name} to JSON...")
-        
-        for post_row in posts_data:
+        for post_row in post_cursor:
             post_dict = {
                 'id': post_row[0],
                 'title': post_row[1],
                 'selftext': post_row[2],
                 'author': post_row[3],
                 'created_utc': post_row[4],
-                'created_datetime': datetime.fromtimestamp(post_row[4]).isoformat(),
-                'score': post_row[5],
-                'num_comments': post_row[6],
-                'url': post_row[7],
-                'permalink': post_row[8],
-                'subreddit': post_row[9],
-                'upvote_ratio': post_row[10],
-                'is_self': bool(post_row[11]),
-                'link_flair_text': post_row[12],
-                'post_hint': post_row[13],
+                'created_datetime': post_row[5],
+                'score': post_row[6],
+                'num_comments': post_row[7],
+                'url': post_row[8],
+                'permalink': post_row[9],
+                'subreddit': post_row[10],
+                'upvote_ratio': post_row[11],
+                'is_self': bool(post_row[12]),
+                'link_flair_text': post_row[13],
+                'post_hint': post_row[14],
                 'comments': []
             }
             
-            # Get comments for this post
-            cursor.execute('''
-                SELECT id, parent_id, body, author, created_utc, score, 
-                       permalink, depth, is_submitter
-                FROM comments 
-                WHERE post_id = ?
-                ORDER BY created_utc ASC
-            ''', (post_row[0],))
-            
-            comments_data = cursor.fetchall()
-            for comment_row in comments_data:
-                comment_dict = {
-                    'id': comment_row[0],
-                    'parent_id': comment_row[1],
-                    'body': comment_row[2],
-                    'author': comment_row[3],
-                    'created_utc': comment_row[4],
-                    'created_datetime': datetime.fromtimestamp(comment_row[4]).isoformat(),
-                    'score': comment_row[5],
-                    'permalink': comment_row[6],
-                    'depth': comment_row[7],
-                    'is_submitter': bool(comment_row[8])
-                }
-                post_dict['comments'].append(comment_dict)
-            
-            subreddit_posts.append(post_dict)
-        
-        # Count totals
-        total_posts = len(subreddit_posts)
-        total_comments = sum(len(post['comments']) for post in subreddit_posts)
-        
-        # Create export data
-        export_data = {
-            'metadata': {
-                'export_date': datetime.now().isoformat(),
-                'total_posts': total_posts,
-                'total_comments': total_comments,
-                'subreddit': subreddit_name,
-                'description': f'r/{subreddit_name} posts and comments - auto-exported after scraping'
-            },
-            'posts': subreddit_posts
-        }
-        
-        # Save to JSON file with subreddit name
-        filename = f'{subreddit_name}_data.json'
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False)
-        
-        conn.close()
-        
-        logger.info(f"✅ Exported r/{subreddit_name} data to {filename}")
-        logger.info(f"📊 Export summary: {total_posts:,} posts, {total_comments:,} comments")
-        
-        return filename
+            if next_group is not None and next_group[0] == post_row[0]:
+                for comment_row in next_group[1]:
+                    comment_dict = {
+                        'id': comment_row[0],
+                        'parent_id': comment_row[1],
+                        'body': comment_row[2],
+                        'author': comment_row[3],
+                        'created_utc': comment_row[4],
+                        'created_datetime': comment_row[5],
+                        'score': comment_row[6],
+                        'permalink': comment_row[7],
+                        'depth': comment_row[8],
+                        'is_submitter': bool(comment_row[9])
+                    }
+                    post_dict['comments'].append(comment_dict)
+                next_group = next(comment_groups, None)
+            
+            yield post_dict
 
     def get_stats(self) -> Dict:
         """Get scraping statistics"""
-        conn = sqlite3.connect(self.database.db_path)
-        cursor = conn.cursor()
+        cursor = self.database.conn.cursor()
         
-        cursor.execute('SELECT COUNT(*) FROM posts')
-        total_posts = cursor.fetchone()[0]
-        
-        cursor.execute('SELECT COUNT(*) FROM comments')
-        total_comments = cursor.fetchone()[0]
-        
-        cursor.execute('SELECT COUNT(DISTINCT post_id) FROM comments')
-        posts_with_comments = cursor.fetchone()[0]
-        
-        cursor.execute('SELECT MIN(created_utc), MAX(created_utc) FROM posts')
-        time_range = cursor.fetchone()
-        
-        conn.close()
+        # All counts in one round-trip; MIN and MAX stay separate subqueries so
+        # each is a single lookup at one end of idx_posts_created_utc
+        cursor.execute('''
+            SELECT
+                (SELECT COUNT(*) FROM posts),
+                (SELECT COUNT(*) FROM comments),
+                (SELECT COUNT(DISTINCT post_id) FROM comments),
+                (SELECT MIN(created_utc) FROM posts),
+                (SELECT MAX(created_utc) FROM posts)
+        ''')
+        total_posts, total_comments, posts_with_comments, earliest_utc, latest_utc = cursor.fetchone()
         
         return {
             'total_posts': total_posts,
             'total_comments': total_comments,
             'posts_with_comments': posts_with_comments,
-            'earliest_post': datetime.fromtimestamp(time_range[0]) if time_range[0] else None,
-            'latest_post': datetime.fromtimestamp(time_range[1]) if time_range[1] else None
+            'earliest_post': datetime.fromtimestamp(earliest_utc) if earliest_utc else None,
+            'latest_post': datetime.fromtimestamp(latest_utc) if latest_utc else None
         }
+    
+    def close(self):
+        """Close the database connection"""
+        self.database.close()
 
 def main():
     """Main function to run the scraper with dynamic keyword options"""
@@ -966,11 +1182,9 @@ def main():
                     with open(filename, 'r', encoding='utf-8') as f:
                         file_content = f.read().strip()
                     
-                    # Handle both line-separated and comma-separated formats
-                    if ',' in file_content:
-                        keywords_input = file_content.replace('\n', ',')
-                    else:
-                        keywords_input = file_content.replace('\n', ',')
+                    # Handle both line-separated and comma-separated formats: lines
+                    # become commas, then share the terminal input's parsing below
+                    keywords_input = file_content.replace('\n', ',')
                     
                     print(f"✅ Loaded keywords from {filename}")
                     
@@ -1116,7 +1330,7 @@ def main():
             if quick_scraper.posts_data:
                 print(f"\n📝 Sample of found posts:")
                 for i, post in enumerate(quick_scraper.posts_data[:5]):
-                    print(f"   {i+1}. {post['title'][:70]}...")
+                    print(f"   {i+1}. {post.title[:70]}...")
                 
                 # Save test results
                 quick_scraper.save_to_json("quick_test_results.json")
@@ -1166,8 +1380,10 @@ def main():
         logger.info("Scraping interrupted by user")
         print("\n⚠️  Scraping interrupted. Partial data may be saved.")
     except Exception as e:
-        logger.error(f"Fatal error: {e}")
+        logger.error("Fatal error: %s", e)
         print(f"\n❌ Error occurred: {e}")
+    finally:
+        scraper.close()
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Shared Scraper Helpers
+======================
+
+Keyword filtering, author lookup and per-thread Reddit instances shared by
+the comprehensive scraper (reddit_scraper.py) and the quick start scraper
+(quick_start.py), so both read and filter posts the same way.
+"""
+
+import praw
+import ahocorasick
+import logging
+import threading
+from functools import lru_cache
+from itertools import cycle
+from typing import Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+@lru_cache(maxsize=8)
+def build_keyword_automaton(keywords: Tuple[str, ...]) -> ahocorasick.Automaton:
+    """Compile keywords into an Aho-Corasick automaton, shared by filters with the same keywords"""
+    automaton = ahocorasick.Automaton()
+    for keyword in keywords:
+        automaton.add_word(keyword, keyword)
+    automaton.make_automaton()
+    return automaton
+
+def author_name(item) -> str:
+    """Author name from the listing data, without lazily loading the Redditor"""
+    author = item.author
+    if author is None:
+        return '[deleted]'
+    return vars(author).get('name', '[deleted]')
+
+class ThreadLocalReddit:
+    """One Reddit instance per thread (PRAW instances are not thread safe)"""
+    
+    def __init__(self, credential_pool: List[Dict[str, str]]):
+        # New threads take the next set of credentials in turn
+        self._credential_cycle = cycle(credential_pool)
+        self._credential_lock = threading.Lock()
+        self._local = threading.local()
+    
+    def get(self) -> praw.Reddit:
+        """Get the calling thread's Reddit instance, creating it on first use"""
+        reddit = getattr(self._local, 'reddit', None)
+        if reddit is None:
+            with self._credential_lock:
+                credentials = next(self._credential_cycle)
+            reddit = self._local.reddit = praw.Reddit(**credentials)
+        return reddit
+
+class KeywordFilterMixin:
+    """
+    Keyword filtering for scrapers
+    
+    Classes using it start with keywords = [] and keyword_mode = 'disabled';
+    set_keyword_filter() sets the rest.
+    """
+    
+    def set_keyword_filter(self, keywords: List[str], mode: str = 'include_only',
+                          case_sensitive: bool = False, search_in_content: bool = True):
+        """
+        Set keyword filtering options
+        
+        Args:
+            keywords: List of keywords to filter by
+            mode: 'include_only' (only posts with keywords), 'exclude' (posts without keywords), 'disabled' (no filtering)
+            case_sensitive: Whether keyword matching should be case sensitive
+            search_in_content: Whether to search in post content (selftext) in addition to title
+        """
+        self.keywords = [k.lower() if not case_sensitive else k for k in keywords]
+        self.keyword_mode = mode
+        self.case_sensitive = case_sensitive
+        self.search_in_content = search_in_content
+        
+        # Compile all keywords into one automaton so each post is scanned in a single pass
+        self.keyword_automaton = build_keyword_automaton(tuple(self.keywords))
+        
+        logger.info("Keyword filter set: mode=%s, keywords=%s, case_sensitive=%s", mode, keywords, case_sensitive)
+    
+    def _matches_keywords(self, post) -> bool:
+        """Check if a post matches the current keyword filter"""
+        if self.keyword_mode == 'disabled' or not self.keywords:
+            return True
+        
+        # Check the title first: a keyword there decides the post without
+        # scanning selftext
+        title = post.title if self.case_sensitive else post.title.lower()
+        matches_any_keyword = next(self.keyword_automaton.iter(title), None) is not None
+        
+        if not matches_any_keyword and self.search_in_content:
+            # Read selftext from the listing data: hasattr() on a post whose
+            # listing omitted it makes PRAW fetch the post
+            content = vars(post).get('selftext')
+            if content:
+                content = content if self.case_sensitive else content.lower()
+                
+                # Scan the joined text so keywords spanning title and selftext still match
+                search_text = f"{title} {content}".strip()
+                matches_any_keyword = next(self.keyword_automaton.iter(search_text), None) is not None
+        
+        # Apply filtering logic based on mode
+        if self.keyword_mode == 'include_only':
+            return matches_any_keyword
+        elif self.keyword_mode == 'exclude':
+            return not matches_any_keyword
+        
+        return True